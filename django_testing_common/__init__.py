@@ -0,0 +1,5 @@
+"""
+Код, общий для проектов YaNews и YaNote.
+
+Каталог добавляется в sys.path пакетами настроек yanews и yanote.
+"""
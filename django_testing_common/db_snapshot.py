@@ -0,0 +1,139 @@
+"""
+Снимок тестовой базы SQLite после миграций.
+
+Django создаёт тестовую базу заново в каждой сессии pytest и проходит
+все миграции. Снимок готовой базы сохраняется в файл, а следующие
+сессии, в том числе параллельные части run_tests.py, копируют его в
+рабочий файл тестовой базы до её создания. Базу затем создаёт обычный
+create_test_db(keepdb=True), как с --reuse-db: migrate находит все
+миграции применёнными и ничего не делает.
+
+Имя снимка — хэш файлов миграций всех приложений, версий Django и
+SQLite и настроек, от которых зависит схема. Любое изменение миграций
+даёт новое имя, и база строится заново; прежние снимки проекта при
+этом удаляются. Каталог снимков задаёт переменная TEST_DB_SNAPSHOT_DIR.
+
+Фикстуры подключаются импортом в conftest.py проекта.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+import django
+import pytest
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SNAPSHOT_DIR_ENV = 'TEST_DB_SNAPSHOT_DIR'
+SCHEMA_SETTINGS = (
+    'INSTALLED_APPS', 'MIGRATION_MODULES', 'AUTH_USER_MODEL',
+    'DEFAULT_AUTO_FIELD',
+)
+
+
+def snapshot_key(connection):
+    """Хэш всего, от чего зависит схема базы после миграций."""
+    digest = hashlib.sha256()
+    parts = [
+        django.get_version(), sqlite3.sqlite_version,
+        connection.settings_dict['ENGINE'],
+        repr(connection.settings_dict['TEST'].get('MIGRATE', True)),
+    ]
+    parts.extend(repr(getattr(settings, name)) for name in SCHEMA_SETTINGS)
+    for part in parts:
+        digest.update(part.encode() + b'\0')
+    for app_config in apps.get_app_configs():
+        migrations = Path(app_config.path) / 'migrations'
+        for path in sorted(migrations.glob('*.py')):
+            digest.update(f'{app_config.label}/{path.name}\0'.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def snapshot_dir():
+    return Path(os.environ.get(SNAPSHOT_DIR_ENV) or Path(
+        tempfile.gettempdir(), 'django_test_snapshots'
+    ))
+
+
+def snapshot_prefix():
+    """Снимки разных проектов лежат в одном каталоге под своим префиксом."""
+    return settings.ROOT_URLCONF.split('.')[0]
+
+
+def snapshot_path(connection):
+    name = f'{snapshot_prefix()}-{snapshot_key(connection)}.sqlite3'
+    return snapshot_dir() / name
+
+
+def work_path():
+    """Рабочий файл тестовой базы, свой у каждого процесса."""
+    return snapshot_dir() / f'{snapshot_prefix()}-test-{os.getpid()}.db'
+
+
+def save_snapshot(connection, path):
+    """
+    Копирует тестовую базу в файл снимка.
+
+    Копия пишется во временный файл и переименовывается, поэтому
+    параллельные сессии видят либо готовый снимок, либо никакого.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    connection.ensure_connection()
+    with closing(sqlite3.connect(tmp_path)) as target:
+        connection.connection.backup(target)
+    os.replace(tmp_path, path)
+    for stale in path.parent.glob(f'{snapshot_prefix()}-*.sqlite3'):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def uses_snapshot():
+    return connections[DEFAULT_DB_ALIAS].vendor == 'sqlite'
+
+
+@pytest.fixture(scope='session')
+def django_db_keepdb(django_db_keepdb):
+    """С SQLite тестовая база берётся из рабочего файла со снимком."""
+    return django_db_keepdb or uses_snapshot()
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings, request):
+    """
+    Тестовая база в рабочем файле, заполненном из снимка.
+
+    Снимок не используется с --create-db. Рабочий файл удаляется после
+    сессии.
+    """
+    if not uses_snapshot():
+        yield
+        return
+    connection = connections[DEFAULT_DB_ALIAS]
+    path = work_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    snapshot = snapshot_path(connection)
+    if snapshot.exists() and not request.config.getvalue('create_db'):
+        shutil.copyfile(snapshot, path)
+    connection.settings_dict['TEST']['NAME'] = str(path)
+    yield
+    path.unlink(missing_ok=True)
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Тестовая база; после миграций с нуля она сохраняется в снимок."""
+    if uses_snapshot():
+        connection = connections[DEFAULT_DB_ALIAS]
+        snapshot = snapshot_path(connection)
+        if not snapshot.exists():
+            with django_db_blocker.unblock():
+                save_snapshot(connection, snapshot)
+    return django_db_setup
@@ -0,0 +1,327 @@
+"""
+Метрики запросов и кэша в текстовом формате Prometheus.
+
+Реестр, общее хранилище процессов, отрисовка, middleware и страница
+/metrics общие для проектов. Каждый проект задаёт только источник
+обращений к своему кэшу в настройке METRICS_CACHE_STATS.
+"""
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.http import Http404, HttpResponse
+from django.utils.module_loading import import_string
+from django.views import generic
+
+from django_testing_common.timing import RequestTimings, record_queries
+
+UNMATCHED = '<unmatched>'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Тип, описание и для гистограмм — верхние границы корзин.
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Запросы по маршруту, методу и статусу ответа.', None
+    ),
+    'http_request_duration_seconds': (
+        'histogram', 'Время обработки запроса в секундах.',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    'http_request_queries': (
+        'histogram', 'Число SQL-запросов за запрос.',
+        (0, 1, 2, 3, 5, 10, 20, 50, 100),
+    ),
+    'cache_hits_total': ('counter', 'Попадания в кэш.', None),
+    'cache_misses_total': ('counter', 'Промахи кэша.', None),
+    'cache_hit_ratio': (
+        'gauge', 'Доля попаданий среди обращений к кэшу.', None
+    ),
+}
+
+
+def merge(target, samples):
+    """Складывает значения samples в target: числа и корзины гистограмм."""
+    for key, value in samples.items():
+        if isinstance(value, list):
+            total = target.setdefault(key, [0] * len(value))
+            for index, item in enumerate(value):
+                total[index] += item
+        else:
+            target[key] = target.get(key, 0) + value
+    return target
+
+
+class Registry:
+    """
+    Метрики процесса с отдельным набором значений у каждого потока.
+
+    Поток пишет только в свой словарь, поэтому запись идёт без
+    блокировок. Сбор складывает копии словарей всех потоков. Ключ
+    значения — пара (имя, метки), гистограмма хранит счётчики корзин,
+    последняя корзина +Inf, затем сумму и число наблюдений.
+
+    Словари завершившихся потоков прибавляются к общему итогу и
+    удаляются при появлении нового потока и при сборе, поэтому сервер,
+    создающий поток на запрос, не копит их без конца.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = {}
+        self._retired = {}
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_finished()
+                self._shards[threading.current_thread()] = shard
+            return shard
+
+    def _retire_finished(self):
+        """Переносит в итог словари потоков, которые больше не пишут."""
+        for thread in [
+            thread for thread in self._shards if not thread.is_alive()
+        ]:
+            merge(self._retired, self._shards.pop(thread))
+
+    def inc(self, name, labels, amount=1):
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        bounds = METRICS[name][2]
+        shard = self._shard()
+        key = (name, labels)
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(bounds) + 3)
+        counts[bisect_left(bounds, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            self._retire_finished()
+            merged = merge({}, self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            merge(merged, {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in shard.copy().items()
+            })
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._retired.clear()
+            for shard in self._shards.values():
+                shard.clear()
+
+
+registry = Registry()
+
+
+class FileStore:
+    """
+    Метрики нескольких процессов в общем каталоге METRICS_DIR.
+
+    Каждый процесс записывает свои итоги в файл <pid>.json не чаще раза
+    в METRICS_FLUSH_INTERVAL секунд, а /metrics складывает все файлы.
+    Файлы завершённых процессов остаются, чтобы счётчики не убывали;
+    каталог нужно очищать при перезапуске сервиса.
+
+    Потоки процесса пишут файл по очереди и берут значения уже под
+    блокировкой, поэтому более старые значения не затирают новые.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._flushed = 0.0
+        self._lock = threading.Lock()
+
+    def _write(self, samples):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f'{os.getpid()}.json'
+        tmp_path = path.with_name(
+            f'{path.name}.{threading.get_ident()}.tmp'
+        )
+        tmp_path.write_text(json.dumps([
+            [name, [list(label) for label in labels], value]
+            for (name, labels), value in samples.items()
+        ]))
+        os.replace(tmp_path, path)
+        self._flushed = monotonic()
+
+    def _due(self):
+        return monotonic() - self._flushed >= settings.METRICS_FLUSH_INTERVAL
+
+    def write(self, samples_func):
+        with self._lock:
+            self._write(samples_func())
+
+    def maybe_write(self, samples_func):
+        """
+        Запись, если с прошлой прошло METRICS_FLUSH_INTERVAL секунд.
+
+        Пока файл пишет другой поток, запрос не ждёт его и не пишет сам.
+        """
+        if not self._due() or not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._due():
+                self._write(samples_func())
+        finally:
+            self._lock.release()
+
+    def read(self):
+        merged = {}
+        for path in self.directory.glob('*.json'):
+            try:
+                rows = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            merge(merged, {
+                (name, tuple(map(tuple, labels))): value
+                for name, labels, value in rows
+            })
+        return merged
+
+
+@lru_cache(maxsize=None)
+def get_store(directory):
+    return FileStore(directory)
+
+
+def store():
+    """Хранилище для METRICS_DIR; None, если процессы не объединяются."""
+    return get_store(settings.METRICS_DIR) if settings.METRICS_DIR else None
+
+
+def cache_samples():
+    """Обращения к кэшу проекта из функции METRICS_CACHE_STATS."""
+    return import_string(settings.METRICS_CACHE_STATS)()
+
+
+def process_samples():
+    return merge(registry.samples(), cache_samples())
+
+
+def collect():
+    """Метрики этого процесса или, с METRICS_DIR, всех процессов."""
+    file_store = store()
+    if file_store is None:
+        return process_samples()
+    file_store.write(process_samples)
+    return file_store.read()
+
+
+def escape(value):
+    return (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+    )
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{escape(value)}"' for name, value in labels)
+    return f'{{{pairs}}}'
+
+
+def render(samples):
+    """Текстовый формат Prometheus 0.0.4."""
+    samples = dict(samples)
+    for (name, labels), hits in list(samples.items()):
+        if name == 'cache_hits_total':
+            total = hits + samples.get(('cache_misses_total', labels), 0)
+            samples[('cache_hit_ratio', labels)] = (
+                hits / total if total else 0.0
+            )
+    rows = defaultdict(list)
+    for (name, labels), value in sorted(samples.items()):
+        rows[name].append((labels, value))
+    lines = []
+    for name, (kind, description, bounds) in METRICS.items():
+        if name not in rows:
+            continue
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in rows[name]:
+            if kind != 'histogram':
+                lines.append(f'{name}{format_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            for bound, count in zip((*bounds, '+Inf'), value):
+                cumulative += count
+                bucket_labels = format_labels((*labels, ('le', bound)))
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {value[-2]}')
+            lines.append(f'{name}_count{format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """
+    Считает запросы, их время и число SQL-запросов по маршрутам.
+
+    Маршрут — имя url из resolver_match, поэтому число меток не растёт
+    с числом записей. Отключается настройкой METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = perf_counter()
+        with record_queries(RequestTimings()) as timings:
+            response = self.get_response(request)
+        match = request.resolver_match
+        route = match.view_name if match else UNMATCHED
+        registry.inc('http_requests_total', (
+            ('route', route), ('method', request.method),
+            ('status', response.status_code),
+        ))
+        labels = (('route', route),)
+        registry.observe(
+            'http_request_duration_seconds', labels,
+            perf_counter() - started
+        )
+        registry.observe('http_request_queries', labels, timings.queries)
+        file_store = store()
+        if file_store is not None:
+            file_store.maybe_write(process_samples)
+        return response
+
+
+class Metrics(generic.View):
+    """
+    Метрики в текстовом формате Prometheus.
+
+    Без METRICS_ENABLED страницы нет. Метрики видят сотрудники и адреса
+    из METRICS_ALLOWED_IPS, остальные получают 403. Адрес берётся из
+    REMOTE_ADDR: за прокси в список вносится адрес, который видит Django.
+    """
+
+    def get(self, request):
+        if not settings.METRICS_ENABLED:
+            raise Http404
+        allowed = request.META.get('REMOTE_ADDR') in (
+            settings.METRICS_ALLOWED_IPS
+        )
+        if not (allowed or request.user.is_staff):
+            raise PermissionDenied
+        return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
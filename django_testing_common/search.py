@@ -0,0 +1,207 @@
+"""
+Полнотекстовый поиск по заголовку и тексту записей модели.
+
+Индекс строится либо на таблице SQLite FTS5, либо, если FTS5
+недоступен, в памяти процесса. Поиск можно ограничить значениями полей
+модели, например автором заметки.
+"""
+import re
+import threading
+from collections import Counter, defaultdict
+from functools import partial
+from math import log
+
+from django.db import connections, router, transaction
+
+FIELDS = ('title', 'text')
+# Совпадение в заголовке весит больше, чем совпадение в тексте.
+TITLE_WEIGHT = 5.0
+TEXT_WEIGHT = 1.0
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Общая часть бэкендов: постраничная выдача результатов."""
+
+    def __init__(self, model, filters=()):
+        self.model = model
+        self.filters = tuple(filters)
+
+    def filter_values(self, filters):
+        return tuple(filters[name] for name in self.filters)
+
+    def page(self, query, page, per_page, **filters):
+        """Id записей страницы результатов и признак следующей страницы."""
+        ids = self.search(
+            query, (page - 1) * per_page, per_page + 1, **filters
+        )
+        return ids[:per_page], len(ids) > per_page
+
+
+class Fts5Index(SearchIndex):
+    """
+    Индекс на виртуальной таблице SQLite FTS5 с внешним содержимым.
+
+    Таблица создаётся миграцией с content, указывающим на таблицу
+    модели, и хранит только сам индекс. Триггеры на таблице модели
+    обновляют индекс в той же транзакции, что и запись, в том числе при
+    bulk_create. Ограничения по полям модели проверяются соединением
+    по rowid, а результаты упорядочиваются по bm25. Базу для запросов
+    выбирает роутер, как и для запросов ORM к модели.
+    """
+
+    def __init__(self, model, table, filters=()):
+        super().__init__(model, filters)
+        self.table = table
+
+    def update(self, instance):
+        """Индекс обновляют триггеры таблицы модели."""
+
+    def update_many(self, queryset):
+        """Индекс обновляют триггеры таблицы модели."""
+
+    def remove(self, pk):
+        """Индекс обновляют триггеры таблицы модели."""
+
+    def rebuild(self):
+        connection = connections[router.db_for_write(self.model)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table} ({self.table}) VALUES ('rebuild')"
+            )
+
+    def search(self, query, offset, limit, **filters):
+        match = ' '.join(f'"{token}"' for token in tokenize(query))
+        if not match:
+            return []
+        table = self.table
+        content = self.model._meta.db_table
+        sql = f'SELECT {table}.rowid FROM {table} '
+        if self.filters:
+            sql += f'JOIN {content} ON {content}.id = {table}.rowid '
+        sql += f'WHERE {table} MATCH %s ' + ''.join(
+            f'AND {content}.{name} = %s ' for name in self.filters
+        )
+        sql += f'ORDER BY bm25({table}, %s, %s) LIMIT %s OFFSET %s'
+        connection = connections[router.db_for_read(self.model)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (
+                match, *self.filter_values(filters),
+                TITLE_WEIGHT, TEXT_WEIGHT, limit, offset,
+            ))
+            return [pk for pk, in cursor.fetchall()]
+
+
+class MemoryIndex(SearchIndex):
+    """
+    Инвертированный индекс в памяти процесса, если FTS5 недоступен.
+
+    Строится из базы при первом поиске и дальше обновляется сигналами
+    после фиксации транзакции. Изменения, сделанные другими процессами,
+    попадут в индекс этого процесса только после rebuild().
+    """
+
+    def __init__(self, model, filters=()):
+        super().__init__(model, filters)
+        self._lock = threading.Lock()
+        self._postings = None
+        self._terms = {}
+        self._values = {}
+
+    def documents(self):
+        """Все записи в виде (id, *filters, title, text)."""
+        return self.model.objects.order_by().values_list(
+            'id', *self.filters, *FIELDS
+        ).iterator()
+
+    def _add(self, pk, *values):
+        *filter_values, title, text = values
+        self._values[pk] = tuple(filter_values)
+        terms = Counter()
+        for weight, value in ((TITLE_WEIGHT, title), (TEXT_WEIGHT, text)):
+            for token in tokenize(value):
+                terms[token] += weight
+        self._terms[pk] = terms
+        for token, score in terms.items():
+            self._postings[token][pk] = score
+
+    def _discard(self, pk):
+        self._values.pop(pk, None)
+        for token in self._terms.pop(pk, ()):
+            postings = self._postings[token]
+            del postings[pk]
+            if not postings:
+                del self._postings[token]
+
+    def _replace(self, pk, *values):
+        with self._lock:
+            if self._postings is not None:
+                self._discard(pk)
+                if values:
+                    self._add(pk, *values)
+
+    def update(self, instance):
+        values = [
+            getattr(instance, name) for name in (*self.filters, *FIELDS)
+        ]
+        transaction.on_commit(partial(self._replace, instance.pk, *values))
+
+    def update_many(self, queryset):
+        """Записи, созданные без сигналов, например bulk_create."""
+        for instance in queryset.only('id', *self.filters, *FIELDS):
+            self.update(instance)
+
+    def remove(self, pk):
+        transaction.on_commit(partial(self._replace, pk))
+
+    def rebuild(self):
+        rows = list(self.documents())
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._terms = {}
+            self._values = {}
+            for row in rows:
+                self._add(*row)
+
+    def search(self, query, offset, limit, **filters):
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        if self._postings is None:
+            self.rebuild()
+        wanted = self.filter_values(filters)
+        with self._lock:
+            postings = [self._postings.get(token, {}) for token in tokens]
+            if not all(postings):
+                return []
+            total = len(self._terms)
+            scores = {
+                pk: sum(
+                    found[pk] * log(1 + total / len(found))
+                    for found in postings
+                )
+                for pk in set.intersection(*map(set, postings))
+                if self._values[pk] == wanted
+            }
+        ranked = sorted(scores, key=lambda pk: (-scores[pk], pk))
+        return ranked[offset:offset + limit]
+
+
+def make_index(model, table, backend, filters=()):
+    """
+    Индекс записей model на выбранном бэкенде.
+
+    При значении auto используется FTS5, если миграция смогла создать
+    таблицу table, иначе индекс в памяти.
+    """
+    if backend == 'auto':
+        connection = connections[router.db_for_write(model)]
+        tables = connection.introspection.table_names()
+        backend = 'fts5' if table in tables else 'memory'
+    if backend == 'fts5':
+        return Fts5Index(model, table, filters)
+    return MemoryIndex(model, filters)
@@ -0,0 +1,28 @@
+"""Настройки, общие для YaNews и YaNote; их импортирует settings проекта."""
+import os
+
+# Замеры запросов в заголовке Server-Timing и в логе django_testing_common.timing.
+REQUEST_TIMING = os.getenv('REQUEST_TIMING') == '1'
+
+# Метрики /metrics; с METRICS_DIR они складываются по всем процессам.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED') == '1'
+
+# Адреса, которым /metrics доступен без входа сотрудника.
+METRICS_ALLOWED_IPS = [
+    ip for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip
+]
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+
+METRICS_FLUSH_INTERVAL = 1
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'django_testing_common.timing': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -0,0 +1,16 @@
+"""Настройка соединений с SQLite, общая для проектов."""
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Настраивает новое соединение с SQLite по SQLITE_PRAGMAS.
+
+    Приёмник сигнала connection_created; его подключает signals.py
+    приложения проекта.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
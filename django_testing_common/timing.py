@@ -0,0 +1,106 @@
+import logging
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """
+    Замеры одного запроса: SQL, отрисовка шаблона и общее время.
+
+    Объект служит обёрткой выполнения запросов connection.execute_wrapper
+    и считает запросы ко всем базам, включая реплики. Время в секундах.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+        self.total = 0.0
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += perf_counter() - started
+
+    def start_render(self):
+        self._render_started = perf_counter()
+
+    def finish_render(self, response):
+        self.render += perf_counter() - self._render_started
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing, время в миллисекундах."""
+        return ', '.join((
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} SQL"',
+            f'render;dur={self.render * 1000:.1f}',
+            f'total;dur={self.total * 1000:.1f}',
+        ))
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db * 1000, 1),
+            'render_ms': round(self.render * 1000, 1),
+            'total_ms': round(self.total * 1000, 1),
+        }
+
+
+@contextmanager
+def record_queries(timings):
+    """Пропускает все SQL-запросы во всех базах через timings."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings))
+        yield timings
+
+
+class RequestTimingMiddleware:
+    """
+    Замеряет каждый запрос и отдаёт результат в Server-Timing и в лог.
+
+    Включается настройкой REQUEST_TIMING. Без неё Django исключает
+    middleware из цепочки при загрузке, и запросы его не проходят.
+    Замеры доступны тестам в атрибуте response.timings.
+    Стоит первым в MIDDLEWARE, чтобы общее время включало остальные.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = request.timings = RequestTimings()
+        started = perf_counter()
+        with record_queries(timings):
+            response = self.get_response(request)
+        timings.total = perf_counter() - started
+        response.timings = timings
+        response['Server-Timing'] = timings.server_timing()
+        logger.info(
+            'request method=%s path=%s status=%s queries=%s db_ms=%s '
+            'render_ms=%s total_ms=%s',
+            request.method, request.path, response.status_code,
+            *timings.as_dict().values(),
+            extra={
+                'method': request.method, 'path': request.path,
+                'status': response.status_code, **timings.as_dict(),
+            }
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        """Шаблон отрисовывается сразу после этого вызова."""
+        request.timings.start_render()
+        response.add_post_render_callback(request.timings.finish_render)
+        return response
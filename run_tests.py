@@ -0,0 +1,269 @@
+"""
+Параллельный запуск проверок YaNews и YaNote.
+
+Порядок проверок и сообщения те же, что были в run_tests.sh: flake8,
+structure_test.py, затем тесты проектов. Тесты обоих проектов идут
+одновременно, и каждый набор делится на части по числу ядер. Каждая
+часть — отдельный процесс pytest со своей базой SQLite в памяти.
+
+Время каждого теста сохраняется в .test_timings.json, и при следующем
+запуске тесты распределяются по частям так, чтобы части шли примерно
+одинаковое время. Отчёты частей объединяются в один JUnit XML.
+
+Модуль также служит плагином pytest (-p run_tests), который записывает
+время тестов своей части в файл из переменной RUN_TESTS_TIMINGS.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from xml.etree import ElementTree
+
+BASE_DIR = Path(__file__).resolve().parent
+TIMINGS_FILE = BASE_DIR / '.test_timings.json'
+TIMINGS_ENV = 'RUN_TESTS_TIMINGS'
+# Код завершения pytest, когда не найдено ни одного теста.
+NO_TESTS_COLLECTED = 5
+# Время теста, которого ещё нет в истории, в секундах.
+DEFAULT_DURATION = 0.1
+
+Project = namedtuple('Project', ('name', 'settings', 'failure'))
+
+PROJECTS = (
+    Project(
+        'ya_news',
+        os.environ.get('DJANGO_SETTINGS_MODULE', 'yanews.settings'),
+        ' При запуске упали ваши тесты для проекта YaNews. '
+        'Проверьте тесты этого проекта ',
+    ),
+    Project(
+        'ya_note',
+        'yanote.settings',
+        ' При запуске упали ваши тесты для проекта YaNote. '
+        'Проверьте тесты этого проекта ',
+    ),
+)
+FLAKE8_PASSED = ' flake8 завершил проверку кода, ошибок не обнаружено '
+FLAKE8_FAILED = (
+    ' flake8 обнаружил отклонения от стандартов, '
+    'приведите код в соответствие с PEP8 '
+)
+STRUCTURE_FAILED = (
+    ' Убедитесь, что написанные вами тесты скопированы '
+    'в указанные в ТЗ директории '
+)
+
+Shard = namedtuple('Shard', ('status', 'output', 'report', 'timings', 'time'))
+
+_durations = {}
+
+
+def pytest_runtest_logreport(report):
+    """Суммирует время подготовки, вызова и завершения теста."""
+    _durations[report.nodeid] = (
+        _durations.get(report.nodeid, 0) + report.duration
+    )
+
+
+def pytest_sessionfinish(session):
+    path = os.environ.get(TIMINGS_ENV)
+    if path:
+        Path(path).write_text(json.dumps(_durations))
+
+
+def print_message(message, symbol, error=False):
+    """Выводит сообщение по центру строки во всю ширину терминала."""
+    width = shutil.get_terminal_size().columns
+    color = '\033[0;31m' if error else '\033[0;32m'
+    print(f'{color}\n{message.center(width, symbol)}\033[0m')
+
+
+def fail(message, status):
+    print_message(message, '=', error=True)
+    print('```', file=sys.stderr)
+    return status
+
+
+def project_env(project, **extra):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': project.settings}
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (str(BASE_DIR), env.get('PYTHONPATH')))
+    )
+    env.update(extra)
+    return env
+
+
+def run_pytest(project, *args, **extra_env):
+    return subprocess.run(
+        [sys.executable, '-m', 'pytest', *args],
+        cwd=BASE_DIR / project.name,
+        env=project_env(project, **extra_env),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+
+
+def collect(project):
+    """Идентификаторы тестов проекта в порядке сбора."""
+    # В addopts проектов стоит -vv, список идентификаторов выводится
+    # только при итоговом уровне -q.
+    result = run_pytest(project, '--collect-only', '-qqq')
+    node_ids = [
+        line for line in result.stdout.splitlines() if '::' in line
+    ]
+    return result.returncode, node_ids, result.stdout
+
+
+def balance(node_ids, durations, count):
+    """
+    Делит тесты на count частей с близким суммарным временем.
+
+    Самые долгие тесты распределяются первыми, каждый — в наименее
+    загруженную часть. Внутри части сохраняется порядок сбора.
+    """
+    default = (
+        sum(durations.values()) / len(durations)
+        if durations else DEFAULT_DURATION
+    )
+    shards = [[0.0, []] for _ in range(min(count, len(node_ids)))]
+    for index in sorted(
+        range(len(node_ids)),
+        key=lambda index: -durations.get(node_ids[index], default)
+    ):
+        shard = min(shards, key=lambda shard: shard[0])
+        shard[0] += durations.get(node_ids[index], default)
+        shard[1].append(index)
+    return [
+        [node_ids[index] for index in sorted(indexes)]
+        for _, indexes in shards
+    ]
+
+
+def run_shard(project, index, node_ids, tmp_dir):
+    report = Path(tmp_dir) / f'{project.name}-{index}.xml'
+    timings = Path(tmp_dir) / f'{project.name}-{index}.json'
+    started = perf_counter()
+    result = run_pytest(
+        project, '--tb=line', '-p', 'run_tests', f'--junitxml={report}',
+        *node_ids, **{TIMINGS_ENV: str(timings)}
+    )
+    return Shard(
+        result.returncode, result.stdout, report, timings,
+        perf_counter() - started
+    )
+
+
+def run_project(project, workers, history, tmp_dir):
+    """
+    Запускает тесты проекта частями и возвращает статус и части.
+
+    Статус — код первой упавшей части или 0.
+    """
+    status, node_ids, output = collect(project)
+    if status or not node_ids:
+        status = status or NO_TESTS_COLLECTED
+        return status, [Shard(status, output, None, None, 0.0)]
+    shards = balance(node_ids, history.get('tests', {}), workers)
+    with ThreadPoolExecutor(len(shards)) as pool:
+        results = list(pool.map(
+            lambda args: run_shard(project, *args, tmp_dir),
+            enumerate(shards)
+        ))
+    status = next((shard.status for shard in results if shard.status), 0)
+    return status, results
+
+
+def save_timings(history, results):
+    """Обновляет историю времени тестов и частей каждого проекта."""
+    for project, (_, shards) in zip(PROJECTS, results):
+        tests = {}
+        for shard in shards:
+            if shard.timings and shard.timings.exists():
+                tests.update(json.loads(shard.timings.read_text()))
+        if tests:
+            history[project.name] = {
+                'tests': tests,
+                'shards': [round(shard.time, 3) for shard in shards],
+            }
+    TIMINGS_FILE.write_text(json.dumps(history, indent=2, sort_keys=True))
+
+
+def merge_reports(results, path):
+    """Объединяет отчёты JUnit XML всех частей в один файл."""
+    merged = ElementTree.Element('testsuites')
+    for project, (_, shards) in zip(PROJECTS, results):
+        for index, shard in enumerate(shards):
+            if not (shard.report and shard.report.exists()):
+                continue
+            for suite in ElementTree.parse(shard.report).getroot().iter(
+                'testsuite'
+            ):
+                suite.set('name', f'{project.name}-{index}')
+                merged.append(suite)
+    ElementTree.ElementTree(merged).write(
+        path, encoding='utf-8', xml_declaration=True
+    )
+
+
+def run_projects(workers, report):
+    """Тесты обоих проектов одновременно; возвращает код завершения."""
+    history = (
+        json.loads(TIMINGS_FILE.read_text()) if TIMINGS_FILE.exists() else {}
+    )
+    per_project = max(1, workers // len(PROJECTS))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ThreadPoolExecutor(len(PROJECTS)) as pool:
+            results = list(pool.map(
+                lambda project: run_project(
+                    project, per_project, history.get(project.name, {}),
+                    tmp_dir
+                ),
+                PROJECTS
+            ))
+        merge_reports(results, report)
+        save_timings(history, results)
+    for project, (status, shards) in zip(PROJECTS, results):
+        for shard in shards:
+            sys.stderr.write(shard.output)
+        if status:
+            return fail(project.failure, status)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--workers', type=int, default=os.cpu_count() or 1,
+        help='Общее число процессов pytest для обоих проектов.'
+    )
+    parser.add_argument(
+        '--junitxml', default=BASE_DIR / 'test-report.xml',
+        help='Куда записать объединённый отчёт.'
+    )
+    args = parser.parse_args()
+    status = subprocess.run(
+        [sys.executable, '-m', 'flake8', '--config=setup.cfg'],
+        cwd=BASE_DIR, stdout=sys.stderr
+    ).returncode
+    if status:
+        return fail(FLAKE8_FAILED, status)
+    print_message(FLAKE8_PASSED, '=')
+    print(file=sys.stderr)
+    status = subprocess.run(
+        [sys.executable, 'structure_test.py'], cwd=BASE_DIR
+    ).returncode
+    if status:
+        return fail(STRUCTURE_FAILED, status)
+    return run_projects(args.workers, args.junitxml)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Скрипты замера производительности YaNews.
+
+Запускаются из каталога ya_news как модули, например:
+    python -m benchmarks.index_plans
+"""
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT_DIR = str(Path(__file__).resolve().parent.parent.parent)
+
+
+def setup_django(db_path):
+    """Настраивает Django на отдельный файл базы данных для замеров."""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    import django
+    django.setup()
+
+
+def timeit(func, repeat):
+    """Среднее время одного вызова функции в миллисекундах."""
+    started = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - started) / repeat * 1000
@@ -0,0 +1,50 @@
+"""
+Сравнение поиска стоп-слов перебором и автоматом Ахо — Корасик.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.bad_words
+"""
+import random
+from time import perf_counter
+
+from benchmarks import timeit
+from news.matcher import WordMatcher
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+DICTIONARY_SIZES = (10, 1_000, 50_000)
+TEXT_LENGTH = 10_000
+REPEAT = 5
+
+
+def random_word(length):
+    return ''.join(random.choice(ALPHABET) for _ in range(length))
+
+
+def loop_find(words, text):
+    """Прежняя проверка: поиск подстроки для каждого слова."""
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+def main():
+    random.seed(0)
+    # Текст без стоп-слов: обоим способам приходится просмотреть всё.
+    text = ' '.join(random_word(6) for _ in range(TEXT_LENGTH // 7))
+    for size in DICTIONARY_SIZES:
+        words = [random_word(12) for _ in range(size)]
+        started = perf_counter()
+        matcher = WordMatcher(words)
+        build = (perf_counter() - started) * 1000
+        loop = timeit(lambda: loop_find(words, text), REPEAT)
+        automaton = timeit(lambda: matcher.find(text), REPEAT)
+        print(
+            f'{size:>6} слов: перебор {loop:9.2f} мс, '
+            f'автомат {automaton:7.2f} мс (построение {build:.0f} мс)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Размер ответа и скорость опроса комментариев: HTML страница против JSON.
+
+Клиент, который следит за новыми комментариями, раньше загружал
+страницу новости целиком. Скрипт сравнивает это с полной лентой
+изменений в JSON и с пустой дельтой по курсору since.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.comments_api --comments 200
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks import setup_django, timeit
+
+REPEAT = 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--comments', type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test import Client
+        from django.urls import reverse
+        from news.models import Comment, CommentChange, News
+
+        call_command('migrate', verbosity=0)
+        author = get_user_model().objects.create(username='Автор')
+        news = News.objects.create(title='Новость', text='Текст новости.')
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text=f'Комментарий {index}')
+            for index in range(args.comments)
+        )
+        # bulk_create не отправляет сигналы, журнал ленты пишется явно.
+        CommentChange.objects.bulk_create(
+            CommentChange(news_id=news.pk, comment_id=pk)
+            for pk in news.comment_set.values_list('pk', flat=True)
+        )
+        # Все комментарии на одной странице, как при опросе с начала.
+        settings.COMMENTS_PER_PAGE = args.comments
+        client = Client(HTTP_HOST='localhost')
+        # Авторизованный клиент обходит кэш страниц, как и любой опрос
+        # с личной страницей.
+        client.force_login(author)
+        detail_url = reverse('news:detail', args=(news.pk,))
+        changes_url = reverse('news:comment_changes', args=(news.pk,))
+        since = client.get(changes_url).json()['since']
+        requests = {
+            'HTML страница новости': (detail_url, {}),
+            'JSON все комментарии': (changes_url, {}),
+            'JSON дельта по since': (changes_url, {'since': since}),
+        }
+        for name, (url, params) in requests.items():
+            size = len(client.get(url, params).content)
+            duration = timeit(lambda: client.get(url, params), REPEAT)
+            print(
+                f'{name}: {size:>8} байт, {1000 / duration:7.0f} запросов/с'
+            )
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
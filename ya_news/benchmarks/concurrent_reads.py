@@ -0,0 +1,133 @@
+"""
+Пропускная способность чтения при одновременной записи комментариев.
+
+Для каждого профиля базы данных скрипт запускается отдельным процессом
+на своём файле базы: несколько потоков читают страницу комментариев
+новости, а один поток всё это время пишет новые комментарии.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.concurrent_reads --readers 4 --seconds 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks import setup_django
+
+PROFILES = ('development', 'production')
+NEWS_COUNT = 100
+COMMENTS_PER_NEWS = 20
+
+
+def seed():
+    """Пользователь, новости и комментарии для чтения."""
+    from django.contrib.auth import get_user_model
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Автор')
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст новости.')
+        for index in range(NEWS_COUNT)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Текст комментария')
+        for news in News.objects.all()
+        for _ in range(COMMENTS_PER_NEWS)
+    )
+    return author
+
+
+def run_thread(work, stop, counts):
+    """Повторяет work до сигнала stop и считает успешные вызовы."""
+    from django.db import OperationalError, connection
+
+    done = errors = 0
+    try:
+        while not stop.is_set():
+            try:
+                work()
+                done += 1
+            except OperationalError:
+                errors += 1
+    finally:
+        connection.close()
+    counts.append((done, errors))
+
+
+def measure(readers, seconds):
+    """Запускает читателей и писателя, выводит результат одной строкой."""
+    from django.conf import settings
+    from news.models import Comment, News
+    from news.pagination import get_comments_page
+
+    author = seed()
+    news_ids = list(News.objects.values_list('id', flat=True))
+
+    def read():
+        get_comments_page(news_ids[int(perf_counter() * 1e6) % NEWS_COUNT])
+
+    def write():
+        Comment.objects.create(
+            news_id=news_ids[0], author=author, text='Новый комментарий'
+        )
+
+    stop = threading.Event()
+    read_counts, write_counts = [], []
+    threads = [
+        threading.Thread(target=run_thread, args=(read, stop, read_counts))
+        for _ in range(readers)
+    ]
+    threads.append(threading.Thread(
+        target=run_thread, args=(write, stop, write_counts)
+    ))
+    for thread in threads:
+        thread.start()
+    stop.wait(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    reads = sum(done for done, _ in read_counts)
+    busy = sum(errors for _, errors in read_counts + write_counts)
+    writes = sum(done for done, _ in write_counts)
+    print(
+        f'{settings.DATABASE_PROFILE:>11}: '
+        f'{reads / seconds:8.0f} чтений/с, '
+        f'{writes / seconds:6.0f} записей/с, ошибок блокировки {busy}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--profile', choices=PROFILES)
+    args = parser.parse_args()
+    if args.profile is None:
+        # Профиль читается настройками при импорте, поэтому каждый
+        # замеряется в отдельном процессе.
+        for profile in PROFILES:
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.concurrent_reads',
+                 '--readers', str(args.readers),
+                 '--seconds', str(args.seconds), '--profile', profile],
+                env={**os.environ, 'DATABASE_PROFILE': profile},
+                check=True
+            )
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.core.management import call_command
+        from django.db import connection
+
+        call_command('migrate', verbosity=0)
+        measure(args.readers, args.seconds)
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
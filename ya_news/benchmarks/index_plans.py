@@ -0,0 +1,108 @@
+"""
+Планы горячих запросов YaNews до и после составных индексов.
+
+База наполняется примерно миллионом строк, затем для каждого запроса
+выводится план SQLite на схеме 0001_initial и после 0002_hot_path_indexes.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.index_plans --rows 1000000
+"""
+import argparse
+import random
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks import setup_django, timeit
+
+BEFORE = '0001_initial'
+AFTER = '0002_hot_path_indexes'
+USERS_COUNT = 1000
+COMMENTS_PER_NEWS = 9
+REPEAT = 200
+
+QUERIES = {
+    'Новости на главной': (
+        'SELECT * FROM news_news ORDER BY date DESC LIMIT 10', ()
+    ),
+    'Комментарии новости': (
+        'SELECT * FROM news_comment WHERE news_id = %s '
+        'ORDER BY created ASC, id ASC LIMIT 21',
+        (1,)
+    ),
+    'Комментарии автора': (
+        'SELECT * FROM news_comment WHERE author_id = %s', (1,)
+    ),
+}
+
+
+def seed(cursor, rows):
+    """Наполняет базу пользователями, новостями и комментариями."""
+    now = datetime.now(timezone.utc)
+    cursor.executemany(
+        'INSERT INTO auth_user (password, last_login, is_superuser, '
+        'username, first_name, last_name, email, is_staff, is_active, '
+        "date_joined) VALUES ('', %s, 0, %s, '', '', '', 0, 1, %s)",
+        ((now, f'user{index}', now) for index in range(USERS_COUNT))
+    )
+    news_count = rows // (COMMENTS_PER_NEWS + 1)
+    today = date.today()
+    cursor.executemany(
+        'INSERT INTO news_news (title, text, date) VALUES (%s, %s, %s)',
+        (
+            (f'Новость {index}', 'Текст новости.',
+             today - timedelta(days=random.randrange(3650)))
+            for index in range(news_count)
+        )
+    )
+    cursor.executemany(
+        'INSERT INTO news_comment (news_id, author_id, text, created) '
+        'VALUES (%s, %s, %s, %s)',
+        (
+            (random.randrange(1, news_count + 1),
+             random.randrange(1, USERS_COUNT + 1),
+             'Текст комментария',
+             now - timedelta(seconds=random.randrange(10 ** 8)))
+            for _ in range(news_count * COMMENTS_PER_NEWS)
+        )
+    )
+    cursor.execute('ANALYZE')
+
+
+def report(cursor, title):
+    """Выводит план и среднее время каждого запроса."""
+    print(f'\n=== {title} ===')
+    for name, (sql, params) in QUERIES.items():
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = '; '.join(row[-1] for row in cursor.fetchall())
+
+        def run():
+            cursor.execute(sql, params)
+            cursor.fetchall()
+
+        print(f'{name}: {timeit(run, REPEAT):.3f} мс\n    {plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.core.management import call_command
+        from django.db import connection, transaction
+
+        call_command('migrate', 'news', BEFORE, verbosity=0)
+        with transaction.atomic(), connection.cursor() as cursor:
+            seed(cursor, args.rows)
+        with connection.cursor() as cursor:
+            report(cursor, BEFORE)
+        call_command('migrate', 'news', AFTER, verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            report(cursor, AFTER)
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
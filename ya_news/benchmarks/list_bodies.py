@@ -0,0 +1,82 @@
+"""
+Объём данных и пиковая память главной страницы с длинными текстами.
+
+Сравнивается прежний запрос со всеми полями новости и новый, который
+вместо text загружает сохранённую выдержку.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.list_bodies
+"""
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks import setup_django
+
+BODY_SIZE = 100 * 1024
+NEWS_COUNT = 50
+
+
+def transferred_bytes(queryset):
+    """Сколько байт значений вернула база данных на запрос."""
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(
+            len(str(value).encode())
+            for row in cursor.fetchall() for value in row
+        )
+
+
+def peak_memory(func):
+    """Пиковое выделение памяти Python за время вызова, в байтах."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.core.management import call_command
+        from django.db import connection
+        from django.template.defaultfilters import truncatewords
+
+        from news.models import News
+
+        call_command('migrate', verbosity=0)
+        words = ('слово ' * (BODY_SIZE // 11)).strip()
+        News.objects.bulk_create(
+            News(title=f'Новость {index}', text=words)
+            for index in range(NEWS_COUNT)
+        )
+        limit = settings.NEWS_COUNT_ON_HOME_PAGE
+        cases = {
+            'все поля и truncatewords': (
+                News.objects.all()[:limit],
+                lambda news: truncatewords(news.text, 15)
+            ),
+            'defer(text) и excerpt': (
+                News.objects.defer('text')[:limit],
+                lambda news: news.excerpt
+            ),
+        }
+        for name, (queryset, render) in cases.items():
+            size = transferred_bytes(queryset)
+            peak = peak_memory(
+                lambda: [render(news) for news in queryset.all()]
+            )
+            print(
+                f'{name}: передано {size / 1024:.1f} КБ, '
+                f'пик памяти {peak / 1024:.1f} КБ'
+            )
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+from functools import partial
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.http import HttpResponse
+from django.utils.crypto import salted_hmac
+from django.views.decorators.http import condition
+
+from .models import CommentChange, News
+
+
+class CacheStats:
+    """Счётчик попаданий и промахов кэша страниц."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ratio(self):
+        """Доля попаданий среди всех обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    """Бэкенд кэша страниц задаётся настройкой NEWS_CACHE_ALIAS."""
+    return caches[settings.NEWS_CACHE_ALIAS]
+
+
+def home_key(version):
+    return f'news:page:home:{version}'
+
+
+def detail_key(pk, version):
+    return f'news:page:detail:{pk}:{version}'
+
+
+def home_version_key():
+    return 'news:version:home'
+
+
+def detail_version_key(pk):
+    return f'news:version:detail:{pk}'
+
+
+def get_version(key):
+    """
+    Версия страницы в кэше — время её последнего сброса в наносекундах.
+
+    Версия входит в ключ закэшированной страницы. Если версии нет
+    в кэше, она начинается с текущего момента, и страница отрисовывается
+    заново. Версия хранится NEWS_VERSION_TIMEOUT секунд, поэтому ключи,
+    созданные запросами к несуществующим новостям, не копятся в кэше.
+    """
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        version = time_ns()
+        if not cache.add(key, version, settings.NEWS_VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def _evict(news_id):
+    """
+    Меняет версии страниц новости.
+
+    Страницы, закэшированные под прежними версиями, удаляются сразу,
+    а не ждут истечения срока хранения.
+    """
+    cache = get_cache()
+    page_keys = {
+        home_version_key(): home_key,
+        detail_version_key(news_id): partial(detail_key, news_id),
+    }
+    cache.delete_many([
+        page_keys[key](version)
+        for key, version in cache.get_many(page_keys).items()
+    ])
+    version = time_ns()
+    cache.set_many(
+        dict.fromkeys(page_keys, version), settings.NEWS_VERSION_TIMEOUT
+    )
+
+
+def invalidate_news(news_id):
+    """
+    Удаляет из кэша страницы, на которых видна новость, и меняет их версии.
+
+    Это страница самой новости и главная страница с числом комментариев.
+    Внутри транзакции сброс повторяется после её фиксации, чтобы
+    параллельный запрос не закэшировал страницу без этих изменений.
+    """
+    _evict(news_id)
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(_evict, news_id))
+
+
+def home_validator():
+    """
+    Состояние главной страницы по данным в базе.
+
+    Время изменения новости обновляется и при сдвиге счётчика
+    комментариев, а число новостей меняется при удалении. Состояние
+    читается из базы, а не из кэша, поэтому изменения других процессов,
+    например фоновой модерации, видны сразу при любом бэкенде кэша.
+    """
+    state = News.objects.aggregate(
+        updated=Max('updated'), count=Count('id')
+    )
+    if state['updated'] is None:
+        return '0'
+    return f"{state['updated'].timestamp()}.{state['count']}"
+
+
+def detail_validator(pk):
+    """
+    Состояние страницы новости по данным в базе.
+
+    Это время изменения новости и последняя запись журнала изменений
+    её комментариев. Журнал пишется после фиксации транзакций, поэтому
+    позднее зафиксированное изменение не спрячется за более ранним.
+    None, если новости нет.
+    """
+    last_change = CommentChange.objects.filter(
+        news_id=OuterRef('pk')
+    ).order_by('-id').values('id')[:1]
+    state = News.objects.filter(pk=pk).values_list(
+        'updated', Subquery(last_change)
+    ).first()
+    if state is None:
+        return None
+    updated, change = state
+    return f'{updated.timestamp()}.{change or 0}'
+
+
+def conditional_page(validator):
+    """
+    Декоратор condition с ETag из состояния страницы в базе.
+
+    validator получает именованные аргументы из адреса страницы.
+    ETag различается для анонимного читателя и каждого пользователя,
+    потому что в страницу входят его имя и форма комментария. Форма
+    содержит CSRF-токен, поэтому в ETag пользователя входит и отпечаток
+    секрета CSRF из cookie: после нового входа секрет меняется, и
+    браузер получает страницу с действующим токеном. Пока cookie нет,
+    токен в странице новый, и ETag пользователю не отдаётся.
+    Last-Modified не отдаётся: с точностью до секунды он пропустил бы
+    изменения, сделанные в ту же секунду, что и прошлый ответ.
+    """
+    def etag(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            secret = request.META.get('CSRF_COOKIE')
+            if secret is None:
+                return None
+            csrf = salted_hmac('news.cache.etag', secret).hexdigest()[:16]
+            viewer = f'{request.user.pk}-{csrf}'
+        else:
+            viewer = '0'
+        state = validator(**kwargs)
+        return None if state is None else f'{state}-{viewer}'
+
+    return condition(etag_func=etag)
+
+
+class AnonymousCacheMixin:
+    """
+    Кэширует отрисованную страницу для анонимных читателей.
+
+    Страницы авторизованных пользователей содержат личные данные
+    (имя, форму с CSRF-токеном, ссылки на правку), поэтому не кэшируются.
+    Запросы со строкой параметров, например следующие страницы
+    комментариев, тоже идут мимо кэша.
+
+    Подкласс задаёт page_key — ключ страницы по параметрам адреса и
+    версии — и version_key — ключ версии по параметрам адреса. Версия
+    читается до отрисовки, поэтому страница, отрисованная во время
+    сброса кэша, записывается под прежней версией, которую уже никто
+    не читает.
+    """
+
+    page_key = None
+    version_key = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.page_key is None or cls.version_key is None:
+            raise ImproperlyConfigured(
+                f'{cls.__name__} должен задать page_key и version_key.'
+            )
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated or request.GET:
+            return super().get(request, *args, **kwargs)
+        cache = get_cache()
+        version = get_version(self.version_key(**self.kwargs))
+        key = self.page_key(version=version, **self.kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+            stats.hits += 1
+            content, headers = cached
+            response = HttpResponse(content)
+            for name, value in headers:
+                response[name] = value
+            return response
+        stats.misses += 1
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda rendered: cache.set(
+                key,
+                (rendered.content, list(rendered.items())),
+                settings.NEWS_CACHE_TIMEOUT
+            )
+        )
+        return response
@@ -0,0 +1,9 @@
+from django.conf import settings
+
+
+def news_cache(request):
+    """Алиас кэша и время хранения для тегов {% cache %} шаблонов новостей."""
+    return {
+        'news_cache_alias': settings.NEWS_CACHE_ALIAS,
+        'comment_fragment_timeout': settings.COMMENT_FRAGMENT_TIMEOUT,
+    }
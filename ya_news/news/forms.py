@@ -1,6 +1,10 @@
+from functools import lru_cache
+
+from django.conf import settings
 from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
+from .matcher import ReloadingMatcher, WordMatcher
 from .models import Comment
 
 BAD_WORDS = (
@@ -11,6 +15,28 @@ BAD_WORDS = (
 WARNING = 'Не ругайтесь!'
 
 
+@lru_cache(maxsize=None)
+def get_bad_words_matcher():
+    """
+    Автомат для поиска стоп-слов строится при первом обращении.
+
+    Если задан BAD_WORDS_FILE, словарь читается из файла и перечитывается
+    после его изменения.
+    """
+    options = {
+        'word_boundary': settings.BAD_WORDS_WORD_BOUNDARY,
+        'homoglyphs': settings.BAD_WORDS_HOMOGLYPHS,
+    }
+    if settings.BAD_WORDS_FILE:
+        return ReloadingMatcher(
+            settings.BAD_WORDS_FILE,
+            settings.BAD_WORDS_RELOAD_INTERVAL,
+            default_words=BAD_WORDS,
+            **options
+        )
+    return WordMatcher(BAD_WORDS, **options)
+
+
 class CommentForm(ModelForm):
 
     class Meta:
@@ -18,10 +44,16 @@ class CommentForm(ModelForm):
         fields = ('text',)
 
     def clean_text(self):
-        """Не позволяем ругаться в комментариях."""
+        """
+        Не позволяем ругаться в комментариях.
+
+        В асинхронном режиме новый комментарий проверяет фоновый
+        обработчик. Правка проверяется сразу в любом режиме: статус
+        комментария при ней не меняется, и повторной модерации нет.
+        """
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        if settings.COMMENT_MODERATION_ASYNC and self.instance.pk is None:
+            return text
+        if get_bad_words_matcher().find(text):
+            raise ValidationError(WARNING)
         return text
@@ -0,0 +1,61 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from news.moderation import moderate_pending
+from news.routers import primary
+
+POOLS = ('process', 'thread')
+
+
+def make_executor(pool, workers):
+    """
+    Пул процессов создаётся только через fork.
+
+    Дочерний процесс наследует настроенный Django и словарь стоп-слов.
+    Запущенный через spawn, он начал бы с ненастроенными settings,
+    поэтому там, где fork недоступен, проверка идёт в потоках.
+    """
+    if pool == 'process' and (
+        'fork' in multiprocessing.get_all_start_methods()
+    ):
+        return ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('fork')
+        )
+    return ThreadPoolExecutor(workers)
+
+
+class Command(BaseCommand):
+    help = 'Публикует или отклоняет комментарии, ожидающие модерации.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--chunk-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=None)
+        parser.add_argument('--pool', choices=POOLS, default='process')
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Не завершаться, а ждать новые комментарии.'
+        )
+        parser.add_argument('--interval', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        # Реплика может ещё не знать о новых комментариях на проверку.
+        with primary(), make_executor(
+            options['pool'], options['workers']
+        ) as executor:
+            while True:
+                published, rejected = moderate_pending(
+                    executor, options['batch_size'], options['chunk_size']
+                )
+                if published or rejected:
+                    self.stdout.write(
+                        f'Опубликовано: {published}, отклонено: {rejected}'
+                    )
+                elif options['watch']:
+                    sleep(options['interval'])
+                else:
+                    break
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from news.models import CommentChange
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет записи журнала изменений комментариев старше '
+        'COMMENT_CHANGES_RETENTION_DAYS дней. Клиент ленты, который '
+        'не обращался к ней дольше этого срока, должен заново загрузить '
+        'страницу новости.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=settings.COMMENT_CHANGES_RETENTION_DAYS
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        deleted = CommentChange.objects.prune(before)
+        self.stdout.write(f'Удалено записей журнала изменений: {deleted}')
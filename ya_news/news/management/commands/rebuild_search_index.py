@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from django_testing_common.search import MemoryIndex
+from news.routers import primary
+from news.search import get_index
+
+
+class Command(BaseCommand):
+    help = 'Полностью перестраивает поисковый индекс новостей.'
+
+    def handle(self, *args, **options):
+        index = get_index()
+        if isinstance(index, MemoryIndex):
+            self.stdout.write(
+                'FTS5 недоступен: индекс в памяти строится каждым '
+                'процессом при первом поиске.'
+            )
+            return
+        # Индекс строится по данным основной базы, а не реплики.
+        with primary():
+            index.rebuild()
+        self.stdout.write('Поисковый индекс новостей перестроен.')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from news.models import Comment, News
+from news.routers import primary
+
+
+class Command(BaseCommand):
+    help = (
+        'Находит новости, у которых счётчик комментариев разошёлся '
+        'с числом опубликованных комментариев, и пересчитывает его.'
+    )
+
+    def handle(self, *args, **options):
+        # Отстающая реплика показала бы расхождения, которых уже нет.
+        with primary():
+            drifted = list(News.objects.annotate(
+                actual=Count(
+                    'comment',
+                    filter=Q(comment__status=Comment.Status.PUBLISHED)
+                )
+            ).exclude(
+                comment_count=F('actual')
+            ).values_list('pk', flat=True))
+            if drifted:
+                News.objects.filter(pk__in=drifted).recount_comments()
+        self.stdout.write(f'Исправлено счётчиков комментариев: {len(drifted)}')
@@ -0,0 +1,169 @@
+import logging
+import os
+import threading
+from collections import deque
+from time import monotonic
+
+# Латинские буквы и цифры, которыми подменяют похожие кириллические.
+HOMOGLYPHS = str.maketrans({
+    'a': 'а',
+    'b': 'в',
+    'c': 'с',
+    'e': 'е',
+    'h': 'н',
+    'k': 'к',
+    'm': 'м',
+    'o': 'о',
+    'p': 'р',
+    't': 'т',
+    'x': 'х',
+    'y': 'у',
+    '0': 'о',
+    '3': 'з',
+})
+
+logger = logging.getLogger(__name__)
+
+
+class WordMatcher:
+    """
+    Автомат Ахо — Корасик для поиска любого из множества слов.
+
+    Автомат строится один раз, после чего текст просматривается за один
+    проход независимо от количества слов в словаре.
+    """
+
+    def __init__(self, words, word_boundary=False, homoglyphs=False):
+        self.word_boundary = word_boundary
+        self.homoglyphs = homoglyphs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for word in words:
+            self._add(self.normalize(word))
+        self._link()
+
+    def normalize(self, text):
+        """Приводит текст к нижнему регистру и, по желанию, к кириллице."""
+        text = text.lower()
+        if self.homoglyphs:
+            text = text.translate(HOMOGLYPHS)
+        return text
+
+    def _add(self, word):
+        if not word:
+            return
+        node = 0
+        for char in word:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = child
+        self._output[node] = (len(word),)
+
+    def _link(self):
+        """Строит суффиксные ссылки обходом бора в ширину."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    @staticmethod
+    def _is_word(text, start, end):
+        before = text[start - 1] if start else ' '
+        after = text[end] if end < len(text) else ' '
+        return not (before.isalnum() or after.isalnum())
+
+    def find(self, text):
+        """Возвращает первое найденное слово или None."""
+        text = self.normalize(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length in output[node]:
+                start = end - length
+                if not self.word_boundary or self._is_word(text, start, end):
+                    return text[start:end]
+        return None
+
+
+def read_words(path):
+    """Слова словаря по одному в строке, строки с # пропускаются."""
+    with open(path, encoding='utf-8') as file:
+        return [
+            word for word in map(str.strip, file)
+            if word and not word.startswith('#')
+        ]
+
+
+class ReloadingMatcher:
+    """
+    Автомат для словаря из файла, который можно менять без перезапуска.
+
+    Не чаще раза в check_interval секунд проверяется время изменения
+    файла. Новый автомат строится в стороне и подменяется одним
+    присваиванием, поэтому проверка текста блокировку не берёт.
+    Пока файл не удаётся прочитать, действует словарь default_words,
+    а после ошибки чтения — последний прочитанный словарь.
+    """
+
+    def __init__(self, path, check_interval, default_words=(), **options):
+        self.path = path
+        self.check_interval = check_interval
+        self.options = options
+        self._state = (None, WordMatcher(default_words, **options))
+        self._reload_lock = threading.Lock()
+        self._next_check = monotonic() + check_interval
+        self._reload()
+
+    @property
+    def matcher(self):
+        """Актуальный автомат; файл проверяется не чаще check_interval."""
+        now = monotonic()
+        if now >= self._next_check and self._reload_lock.acquire(False):
+            try:
+                self._next_check = now + self.check_interval
+                self._reload()
+            finally:
+                self._reload_lock.release()
+        return self._state[1]
+
+    def _reload(self):
+        """
+        Строит автомат по изменившемуся файлу.
+
+        Если файл не читается как UTF-8, например записан не до конца,
+        остаётся прежний автомат, а файл перечитывается при следующем
+        изменении.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._state[0]:
+                return
+            words = read_words(self.path)
+        except OSError:
+            return
+        except ValueError:
+            logger.warning(
+                'Словарь %s не прочитан, действует прежний.', self.path,
+                exc_info=True
+            )
+            self._state = (mtime, self._state[1])
+            return
+        self._state = (mtime, WordMatcher(words, **self.options))
+
+    def find(self, text):
+        return self.matcher.find(text)
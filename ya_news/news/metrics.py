@@ -0,0 +1,11 @@
+"""Источник обращений к кэшу для django_testing_common.metrics."""
+from .cache import stats
+
+
+def cache_samples():
+    """Обращения к кэшу страниц новостей."""
+    labels = (('cache', 'news_pages'),)
+    return {
+        ('cache_hits_total', labels): stats.hits,
+        ('cache_misses_total', labels): stats.misses,
+    }
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:05
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    news_list = list(News.objects.only('id', 'text'))
+    for news in news_list:
+        news.excerpt = Truncator(news.text).words(15, truncate=' …')
+    News.objects.bulk_update(news_list, ('excerpt',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_comment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
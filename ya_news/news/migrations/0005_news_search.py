@@ -0,0 +1,36 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:10
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_search_table(apps, schema_editor):
+    """Таблица FTS5 создаётся, только если SQLite собран с этим модулем."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE news_search USING fts5(title, text)'
+        )
+    except OperationalError:
+        return
+    schema_editor.execute(
+        'INSERT INTO news_search (rowid, title, text) '
+        'SELECT id, title, text FROM news_news'
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS news_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_excerpt'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:13
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    db_alias = schema_editor.connection.alias
+    published = Comment.objects.using(db_alias).filter(
+        news=models.OuterRef('pk'), status='published'
+    ).order_by().values('news').annotate(
+        count=models.Count('id')
+    ).values('count')
+    News.objects.using(db_alias).update(
+        comment_count=Coalesce(models.Subquery(published), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_news_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
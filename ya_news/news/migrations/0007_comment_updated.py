@@ -0,0 +1,30 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def copy_created(apps, schema_editor):
+    Comment = apps.get_model('news', 'Comment')
+    Comment.objects.using(schema_editor.connection.alias).update(
+        updated=models.F('created')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_news_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created, migrations.RunPython.noop),
+    ]
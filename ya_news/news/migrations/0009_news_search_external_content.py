@@ -0,0 +1,78 @@
+# Generated by Django 3.2.15 on 2026-10-18 21:05
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+TRIGGERS = (
+    'CREATE TRIGGER news_search_insert AFTER INSERT ON news_news BEGIN '
+    'INSERT INTO news_search (rowid, title, text) '
+    'VALUES (new.id, new.title, new.text); END',
+    'CREATE TRIGGER news_search_delete AFTER DELETE ON news_news BEGIN '
+    "INSERT INTO news_search (news_search, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    'CREATE TRIGGER news_search_update AFTER UPDATE OF title, text '
+    'ON news_news BEGIN '
+    "INSERT INTO news_search (news_search, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    'INSERT INTO news_search (rowid, title, text) '
+    'VALUES (new.id, new.title, new.text); END',
+)
+
+
+def drop_search_table(schema_editor):
+    for name in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS news_search_{name}')
+    schema_editor.execute('DROP TABLE IF EXISTS news_search')
+
+
+def create_external_content_table(apps, schema_editor):
+    """
+    Индекс без копии текста, которую раньше заполняли сигналы.
+
+    Таблица читает заголовок и текст из news_news, а триггеры обновляют
+    индекс при любой записи, включая bulk_create.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_search_table(schema_editor)
+    try:
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE news_search USING fts5('
+            "title, text, content='news_news', content_rowid='id')"
+        )
+    except OperationalError:
+        return
+    for trigger in TRIGGERS:
+        schema_editor.execute(trigger)
+    schema_editor.execute(
+        "INSERT INTO news_search (news_search) VALUES ('rebuild')"
+    )
+
+
+def restore_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_search_table(schema_editor)
+    try:
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE news_search USING fts5(title, text)'
+        )
+    except OperationalError:
+        return
+    schema_editor.execute(
+        'INSERT INTO news_search (rowid, title, text) '
+        'SELECT id, title, text FROM news_news'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_comment_news_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_external_content_table, restore_search_table
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.15 on 2026-10-18 21:30
+
+from django.db import migrations
+from django.utils.text import Truncator
+
+
+def refill_excerpts(apps, schema_editor):
+    """
+    Заполняет выдержки, которые не заполнила 0004_news_excerpt.
+
+    С репликами 0004 читала новости через роутер, то есть с реплики,
+    и могла записать выдержки не всем новостям. Здесь и чтение, и
+    запись идут через соединение, к которому применяется миграция.
+    """
+    News = apps.get_model('news', 'News')
+    db_alias = schema_editor.connection.alias
+    news_list = list(
+        News.objects.using(db_alias).filter(excerpt='').only('id', 'text')
+    )
+    for news in news_list:
+        news.excerpt = Truncator(news.text).words(15, truncate=' …')
+    News.objects.using(db_alias).bulk_update(
+        news_list, ('excerpt',), batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_news_search_external_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(refill_excerpts, migrations.RunPython.noop),
+    ]
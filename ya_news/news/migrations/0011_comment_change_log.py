@@ -0,0 +1,43 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:48
+
+from django.db import migrations, models
+
+
+def log_published_comments(apps, schema_editor):
+    """Лента начинается с уже опубликованных комментариев."""
+    Comment = apps.get_model('news', 'Comment')
+    CommentChange = apps.get_model('news', 'CommentChange')
+    db_alias = schema_editor.connection.alias
+    CommentChange.objects.using(db_alias).bulk_create((
+        CommentChange(news_id=news_id, comment_id=comment_id)
+        for news_id, comment_id in Comment.objects.using(db_alias).filter(
+            status='published'
+        ).order_by('updated', 'id').values_list('news_id', 'id').iterator()
+    ), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_refill_news_excerpts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('news_id', models.BigIntegerField()),
+                ('comment_id', models.BigIntegerField()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_news_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='commentchange',
+            index=models.Index(fields=['news_id', 'id'], name='change_news_id_idx'),
+        ),
+        migrations.RunPython(log_published_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:04
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+TRIGGERS = import_module(
+    'news.migrations.0009_news_search_external_content'
+).TRIGGERS
+
+
+def restore_search_triggers(apps, schema_editor):
+    """
+    SQLite пересоздаёт news_news при добавлении поля, и триггеры
+    поискового индекса удаляются вместе со старой таблицей.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    if 'news_search' not in connection.introspection.table_names():
+        return
+    for name in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS news_search_{name}')
+    for trigger in TRIGGERS:
+        schema_editor.execute(trigger)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0011_comment_change_log'),
+    ]
+
+    operations = [
+        # При откате поле удаляется с тем же пересозданием таблицы.
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['updated'], name='news_updated_idx'),
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+    ]
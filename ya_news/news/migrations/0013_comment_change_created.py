@@ -0,0 +1,20 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:31
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_news_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commentchange',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
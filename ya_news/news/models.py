@@ -1,27 +1,105 @@
 from datetime import datetime
+from functools import partial
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 15
+
+
+def make_excerpt(text):
+    """Начало текста для списка новостей, как у фильтра truncatewords."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Выдержки заполняются и при массовом создании новостей."""
+        objs = list(objs)
+        for news in objs:
+            news.excerpt = make_excerpt(news.text)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def shift_comment_count(self, news_id, delta):
+        """Сдвигает счётчик комментариев новости на стороне базы."""
+        return self.filter(pk=news_id).update(
+            comment_count=models.F('comment_count') + delta,
+            updated=timezone.now(),
+        )
+
+    def recount_comments(self):
+        """Пересчитывает счётчики комментариев выборки одним UPDATE."""
+        published = Comment.objects.filter(
+            news=models.OuterRef('pk'), status=Comment.Status.PUBLISHED
+        ).order_by().values('news').annotate(
+            count=models.Count('id')
+        ).values('count')
+        return self.update(
+            comment_count=Coalesce(models.Subquery(published), 0),
+            updated=timezone.now(),
+        )
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    excerpt = models.TextField(editable=False, blank=True)
+    comment_count = models.IntegerField(default=0, editable=False)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date', 'id'), name='news_date_id_idx'),
+            models.Index(fields=('updated',), name='news_updated_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Выдержка хранится в базе, чтобы список не загружал весь текст.
+
+        Счётчик комментариев меняется только запросами UPDATE с F(),
+        поэтому при сохранении уже существующей новости он не
+        перезаписывается значением, загруженным вместе с объектом.
+        Время изменения, от которого зависит ETag страниц, сохраняется
+        при любом наборе полей.
+        """
+        self.excerpt = make_excerpt(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        elif update_fields is not None:
+            extra = {'excerpt'} if 'text' in update_fields else set()
+            kwargs['update_fields'] = {*update_fields, *extra, 'updated'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'На модерации'
+        PUBLISHED = 'published', 'Опубликован'
+        REJECTED = 'rejected', 'Отклонён'
+
     news = models.ForeignKey(
         News,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False,
     )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -29,9 +107,80 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PUBLISHED,
+    )
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created'), name='comment_news_created_idx'
+            ),
+            models.Index(
+                fields=('id',),
+                condition=models.Q(status='pending'),
+                name='comment_pending_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class CommentChangeQuerySet(models.QuerySet):
+
+    def log(self, changes):
+        """
+        Записывает пары (id новости, id комментария) после фиксации.
+
+        Id записи выдаётся при вставке уже после фиксации транзакции,
+        поэтому записи идут в том порядке, в каком изменения стали
+        видны читателям, а не в порядке начала транзакций.
+        """
+        changes = [
+            self.model(news_id=news_id, comment_id=comment_id)
+            for news_id, comment_id in changes
+        ]
+        if changes:
+            transaction.on_commit(partial(self.bulk_create, changes))
+
+    def prune(self, before):
+        """
+        Удаляет записи, сделанные раньше before.
+
+        Id записей растут вместе со временем их создания, поэтому граница
+        ищется по первичному ключу от начала журнала, а удаляется
+        диапазон id без индекса по времени.
+        """
+        first_kept = self.filter(created__gte=before).order_by(
+            'id'
+        ).values_list('id', flat=True).first()
+        old = self.all() if first_kept is None else self.filter(
+            id__lt=first_kept
+        )
+        return old.delete()[0]
+
+
+class CommentChange(models.Model):
+    """
+    Журнал изменений комментариев для ленты изменений.
+
+    Запись говорит только о том, что комментарий изменился: его текущее
+    состояние берётся из самого комментария. Внешних ключей нет, чтобы
+    запись об удалении пережила и комментарий, и новость. Старые записи
+    удаляет команда prune_comment_changes.
+    """
+    news_id = models.BigIntegerField()
+    comment_id = models.BigIntegerField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = CommentChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('news_id', 'id'), name='change_news_id_idx'),
+        )
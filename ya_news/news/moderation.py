@@ -0,0 +1,66 @@
+from itertools import chain
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_news
+from .forms import get_bad_words_matcher
+from .models import Comment, CommentChange, News
+
+
+def check_texts(texts):
+    """
+    Для каждого текста возвращает, можно ли его опубликовать.
+
+    Функция выполняется в потоке или процессе обработчика, поэтому
+    обращается только к словарю стоп-слов, но не к базе данных.
+    """
+    matcher = get_bad_words_matcher()
+    return [matcher.find(text) is None for text in texts]
+
+
+def moderate_pending(executor, batch_size, chunk_size):
+    """
+    Проверяет очередную пачку комментариев, ожидающих модерации.
+
+    Тексты пачки делятся на части по chunk_size и проверяются параллельно
+    в executor. Статусы обновляются двумя запросами, счётчики
+    комментариев затронутых новостей пересчитываются третьим, после чего
+    из кэша удаляются их страницы, а в журнал ленты изменений
+    записываются опубликованные комментарии.
+    Возвращает количество опубликованных и отклонённых комментариев.
+    """
+    pending = list(
+        Comment.objects.filter(
+            status=Comment.Status.PENDING
+        ).order_by('id').values_list('id', 'news_id', 'text')[:batch_size]
+    )
+    if not pending:
+        return 0, 0
+    verdicts = chain.from_iterable(executor.map(check_texts, (
+        [text for _, _, text in pending[start:start + chunk_size]]
+        for start in range(0, len(pending), chunk_size)
+    )))
+    published, rejected = [], []
+    for (pk, _, _), allowed in zip(pending, verdicts):
+        (published if allowed else rejected).append(pk)
+    with transaction.atomic():
+        for ids, status in (
+            (published, Comment.Status.PUBLISHED),
+            (rejected, Comment.Status.REJECTED),
+        ):
+            Comment.objects.filter(
+                id__in=ids, status=Comment.Status.PENDING
+            ).update(status=status, updated=timezone.now())
+        news_ids = {news_id for _, news_id, _ in pending}
+        News.objects.filter(pk__in=news_ids).recount_comments()
+        # update() не отправляет сигналы, журнал пишется явно. Отклонённые
+        # комментарии читатели не видели, и в ленте им делать нечего.
+        published_ids = set(published)
+        CommentChange.objects.log(
+            (news_id, pk) for pk, news_id, _ in pending
+            if pk in published_ids
+        )
+    for news_id in news_ids:
+        invalidate_news(news_id)
+    return len(published), len(rejected)
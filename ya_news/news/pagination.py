@@ -0,0 +1,101 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.db.models import Q
+
+from .models import Comment, CommentChange
+
+CURSOR_SEPARATOR = '|'
+INVALID_CURSOR = 'Некорректный курсор страницы комментариев.'
+
+
+def encode_cursor(moment, pk):
+    """Курсор указывает на последний показанный комментарий."""
+    raw = f'{moment.isoformat()}{CURSOR_SEPARATOR}{pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (время, id) из курсора."""
+    try:
+        created, pk = urlsafe_b64decode(
+            cursor.encode()
+        ).decode().split(CURSOR_SEPARATOR)
+        return datetime.fromisoformat(created), int(pk)
+    except ValueError as error:
+        raise BadRequest(INVALID_CURSOR) from error
+
+
+def get_comments_page(news_id, cursor=None, limit=None):
+    """
+    Страница опубликованных комментариев новости, следующая за курсором.
+
+    Комментарии отбираются сравнением по паре (created, id), поэтому
+    любая страница стоит столько же, сколько первая, и не требует OFFSET.
+    Возвращает список комментариев и курсор следующей страницы
+    (None, если страница последняя).
+    """
+    limit = limit or settings.COMMENTS_PER_PAGE
+    comments = Comment.objects.filter(
+        news_id=news_id, status=Comment.Status.PUBLISHED
+    ).select_related('author').order_by('created', 'id')
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        comments = comments.filter(
+            Q(created__gt=created) | Q(created=created, id__gt=pk)
+        )
+    page = list(comments[:limit + 1])
+    if len(page) > limit:
+        last = page[limit - 1]
+        return page[:limit], encode_cursor(last.created, last.pk)
+    return page, None
+
+
+# Имена колонок в ответе и поля, из которых они берутся.
+CHANGE_FIELDS = {
+    'id': 'id',
+    'author': 'author__username',
+    'text': 'text',
+    'created': 'created',
+    'updated': 'updated',
+}
+
+
+def get_comment_changes(news_id, since=None, limit=None):
+    """
+    Изменения комментариев новости после курсора since.
+
+    Курсор — id последней прочитанной записи журнала CommentChange.
+    Журнал пишется после фиксации транзакций, поэтому изменение,
+    зафиксированное позже, не окажется перед курсором, даже если
+    комментарий изменили раньше. Опубликованные комментарии отдаются
+    кортежами values_list в порядке их последнего изменения, а id
+    удалённых и снятых с публикации — списком removed.
+    Возвращает строки, removed, курсор для следующего запроса и признак
+    того, что изменений больше, чем limit.
+    """
+    limit = limit or settings.COMMENTS_PER_PAGE
+    changes = CommentChange.objects.filter(news_id=news_id).order_by('id')
+    if since:
+        try:
+            changes = changes.filter(id__gt=int(since))
+        except ValueError as error:
+            raise BadRequest(INVALID_CURSOR) from error
+    changes = list(changes.values_list('id', 'comment_id')[:limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        since = str(changes[-1][0])
+    # Позиция последнего изменения каждого комментария.
+    order = {comment_id: index for index, (_, comment_id) in enumerate(
+        changes
+    )}
+    rows = sorted(Comment.objects.filter(
+        pk__in=order, status=Comment.Status.PUBLISHED
+    ).values_list(*CHANGE_FIELDS.values()), key=lambda row: order[row[0]])
+    removed = sorted(
+        order.keys() - {row[0] for row in rows}, key=order.__getitem__
+    )
+    return rows, removed, since, has_more
@@ -1,13 +1,108 @@
-from datetime import datetime, timedelta
+from collections import namedtuple
+from datetime import date, timedelta
 
 import pytest
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
 from django.test.client import Client
 from django.urls import reverse
-from django.utils import timezone
 
+from django_testing_common.db_snapshot import (  # noqa: F401
+    django_db_keepdb, django_db_modify_db_settings, django_db_setup
+)
+from news.cache import get_cache, stats
 from news.models import Comment, News
 
+COMMENTS_COUNT = 10
+MANY_COMMENTS_COUNT = 3000
+
+Seeded = namedtuple(
+    'Seeded', ('home_news', 'commented_news', 'crowded_news')
+)
+
+
+def seed_comments(news, author, count):
+    """
+    Комментарии к новости, созданные до начала теста.
+
+    auto_now_add подменяет явное время создания и в bulk_create,
+    поэтому комментарии сдвигаются в прошлое следующим запросом
+    update(). Время каждого комментария bulk_create берёт отдельно,
+    и порядок создания сохраняется.
+    """
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Tекст {index}')
+        for index in range(count)
+    )
+    news.comment_set.update(
+        created=F('created') - timedelta(minutes=count)
+    )
+    News.objects.shift_comment_count(news.pk, count)
+    news.comment_count += count
+
+
+def seed():
+    """Общие данные только для чтения для тестов одного модуля."""
+    today = date.today()
+    News.objects.bulk_create(
+        News(
+            title=f'Новость {index}',
+            text='Просто текст.',
+            date=today - timedelta(days=index)
+        )
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
+    )
+    author = get_user_model().objects.create(username='Комментатор')
+    commented_news = News.objects.create(
+        title='Обсуждаемая новость', text='Текст'
+    )
+    seed_comments(commented_news, author, COMMENTS_COUNT)
+    # Новость с завтрашней датой — первая на главной странице.
+    crowded_news = News.objects.create(
+        title='Популярная новость', text='Текст',
+        date=today + timedelta(days=1)
+    )
+    seed_comments(crowded_news, author, MANY_COMMENTS_COUNT)
+    return Seeded(
+        settings.NEWS_COUNT_ON_HOME_PAGE + 1, commented_news, crowded_news
+    )
+
+
+@pytest.fixture(scope='module')
+def seeded(django_db_setup, django_db_blocker):
+    """
+    Фикстура общих данных, созданных один раз за модуль.
+
+    Как и setUpTestData в TestCase, данные создаются в транзакции,
+    открытой на время модуля. Тесты идут во вложенных точках
+    сохранения и видят данные в исходном виде, а после модуля
+    транзакция откатывается, и другие модули их не видят.
+    """
+    with django_db_blocker.unblock():
+        atomic = transaction.atomic()
+        atomic.__enter__()
+        data = seed()
+    yield data
+    with django_db_blocker.unblock():
+        transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+
+
+@pytest.fixture(autouse=True)
+def page_cache():
+    """Фикстура пустого кэша страниц со сброшенными счётчиками."""
+    get_cache().clear()
+    stats.reset()
+    return stats
+
+
+@pytest.fixture(autouse=True)
+def primary_only(settings):
+    """Фикстура чтения из основной базы, даже если заданы реплики."""
+    settings.DATABASE_REPLICAS = []
+
 
 @pytest.fixture
 def author(django_user_model):
@@ -48,18 +143,9 @@ def news():
 
 
 @pytest.fixture
-def all_news(scope="module"):
-    """Фикстура списка объектов новостей."""
-    today = datetime.today()
-    all_news = [
-        News(
-            title=f'Новость {index}',
-            text='Просто текст.',
-            date=today - timedelta(days=index)
-        )
-        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
-    ]
-    News.objects.bulk_create(all_news)
+def all_news(seeded):
+    """Фикстура новостей для главной страницы из общих данных."""
+    return seeded.home_news
 
 
 @pytest.fixture
@@ -70,19 +156,20 @@ def comment(author, news):
         author=author,
         text='Текст комментария'
     )
+    News.objects.shift_comment_count(news.pk, 1)
     return comment
 
 
 @pytest.fixture
-def comments(author, news, scope="module"):
-    """Фикстура списка объектов комментариев."""
-    now = timezone.now()
-    for index in range(10):
-        comment = Comment.objects.create(
-            news=news, author=author, text=f'Tекст {index}',
-        )
-        comment.created = now + timedelta(days=index)
-        comment.save()
+def commented_news(seeded):
+    """Фикстура новости с несколькими комментариями из общих данных."""
+    return seeded.commented_news
+
+
+@pytest.fixture
+def crowded_news(seeded):
+    """Фикстура новости с множеством комментариев из общих данных."""
+    return seeded.crowded_news
 
 
 @pytest.fixture
@@ -0,0 +1,190 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, CommentChange
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def committed(django_capture_on_commit_callbacks):
+    """Фикстура фиксации транзакции: журнал изменений пишется после неё."""
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+@pytest.fixture
+def comment(author, news, committed):
+    """Фикстура комментария, уже попавшего в журнал изменений."""
+    with committed():
+        return Comment.objects.create(
+            news=news, author=author, text='Текст комментария'
+        )
+
+
+@pytest.fixture
+def changes_url(news):
+    """Фикстура url ленты изменений комментариев."""
+    return reverse('news:comment_changes', args=(news.id,))
+
+
+def get_changes(client, url, **params):
+    """Ответ ленты изменений."""
+    return client.get(url, params).json()
+
+
+def get_texts(client, url, **params):
+    """Тексты комментариев из ответа и курсор следующего запроса."""
+    data = get_changes(client, url, **params)
+    text = data['fields'].index('text')
+    return [row[text] for row in data['comments']], data['since']
+
+
+def test_changes_return_only_new_comments(
+    client, author, news, comment, changes_url, committed
+):
+    """Проверка, что по курсору приходят только новые комментарии."""
+    texts, since = get_texts(client, changes_url)
+    assert texts == [comment.text]
+    assert get_texts(client, changes_url, since=since) == ([], since)
+    with committed():
+        Comment.objects.create(news=news, author=author, text='Новый')
+    assert get_texts(client, changes_url, since=since)[0] == ['Новый']
+
+
+def test_changes_include_edited_comment(
+    client, comment, changes_url, committed
+):
+    """Проверка, что исправленный комментарий приходит снова."""
+    _, since = get_texts(client, changes_url)
+    with committed():
+        comment.text = 'Исправленный текст'
+        comment.save()
+    assert get_texts(client, changes_url, since=since)[0] == [comment.text]
+
+
+def test_late_commit_is_not_skipped(
+    client, author, news, comment, changes_url, committed,
+    django_capture_on_commit_callbacks
+):
+    """Проверка комментария, транзакция которого зафиксирована позже."""
+    _, since = get_texts(client, changes_url)
+    with django_capture_on_commit_callbacks() as first_commit:
+        Comment.objects.create(news=news, author=author, text='Раньше')
+    with committed():
+        Comment.objects.create(news=news, author=author, text='Позже')
+    texts, since = get_texts(client, changes_url, since=since)
+    assert texts == ['Позже']
+    for callback in first_commit:
+        callback()
+    assert get_texts(client, changes_url, since=since)[0] == ['Раньше']
+
+
+def reject(comment):
+    comment.status = Comment.Status.REJECTED
+    comment.save()
+
+
+@pytest.mark.parametrize('remove', (Comment.delete, reject))
+def test_removed_comment_is_reported(
+    client, comment, changes_url, committed, remove
+):
+    """Проверка удалённого и снятого с публикации комментария."""
+    since = get_changes(client, changes_url)['since']
+    comment_id = comment.pk
+    with committed():
+        remove(comment)
+    data = get_changes(client, changes_url, since=since)
+    assert data['comments'] == []
+    assert data['removed'] == [comment_id]
+
+
+def test_moderated_comment_is_reported(
+    client, author, news, changes_url, committed, settings
+):
+    """Проверка комментария, опубликованного фоновой модерацией."""
+    settings.COMMENT_MODERATION_ASYNC = True
+    with committed():
+        Comment.objects.create(
+            news=news, author=author, text='На проверке',
+            status=Comment.Status.PENDING
+        )
+    assert get_texts(client, changes_url) == ([], None)
+    with committed():
+        call_command('moderate_comments', pool='thread', stdout=StringIO())
+    assert get_texts(client, changes_url)[0] == ['На проверке']
+
+
+def test_wait_returns_new_comment(
+    client, author, news, comment, changes_url, committed, monkeypatch
+):
+    """Проверка ответа ожидающему клиенту после нового комментария."""
+    _, since = get_texts(client, changes_url)
+
+    def comment_while_waiting(seconds):
+        with committed():
+            Comment.objects.create(news=news, author=author, text='Новый')
+
+    monkeypatch.setattr('news.views.sleep', comment_while_waiting)
+    texts, _ = get_texts(client, changes_url, since=since, wait=10)
+    assert texts == ['Новый']
+
+
+def test_wait_sees_change_of_other_process(
+    client, author, news, comment, changes_url, committed, monkeypatch
+):
+    """Проверка ожидания изменения, о котором кэш процесса не знает."""
+    _, since = get_texts(client, changes_url)
+    sleeps = []
+
+    def comment_while_waiting(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 1:
+            with patch('news.signals.invalidate_news'), committed():
+                Comment.objects.create(
+                    news=news, author=author, text='Другой'
+                )
+
+    monkeypatch.setattr('news.views.sleep', comment_while_waiting)
+    texts, _ = get_texts(client, changes_url, since=since, wait=10)
+    assert texts == ['Другой']
+    assert len(sleeps) == 1
+
+
+def test_prune_keeps_recent_changes(author, news, committed, settings):
+    """Проверка удаления записей журнала старше срока хранения."""
+    with committed():
+        old, recent = (
+            Comment.objects.create(news=news, author=author, text=text)
+            for text in ('Старый', 'Свежий')
+        )
+    CommentChange.objects.filter(comment_id=old.pk).update(
+        created=timezone.now() - timedelta(
+            days=settings.COMMENT_CHANGES_RETENTION_DAYS + 1
+        )
+    )
+    call_command('prune_comment_changes', stdout=StringIO())
+    assert list(CommentChange.objects.values_list(
+        'comment_id', flat=True
+    )) == [recent.pk]
+
+
+@pytest.mark.parametrize('wait', ('abc', '-1', '²'))
+def test_invalid_wait(client, changes_url, wait):
+    """Проверка ответа на некорректное время ожидания."""
+    response = client.get(changes_url, {'wait': wait})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('since', ('abc', '²'))
+def test_invalid_since(client, changes_url, since):
+    """Проверка ответа на некорректный курсор."""
+    response = client.get(changes_url, {'since': since})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,299 @@
+from http import HTTPStatus
+from time import time
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.exceptions import ImproperlyConfigured
+from django.test.client import Client
+from django.urls import reverse
+from django.views import generic
+from pytest_lazyfixture import lazy_fixture as lf
+
+from news.cache import (
+    AnonymousCacheMixin, detail_version_key, get_cache, invalidate_news
+)
+from news.models import Comment, News
+from news.views import NewsDetail
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def other_news():
+    """Фикстура второй новости."""
+    return News.objects.create(title='Другая', text='Текст')
+
+
+@pytest.fixture
+def other_news_detail_url(other_news):
+    """Фикстура url страницы второй новости."""
+    return reverse('news:detail', args=(other_news.id,))
+
+
+def test_anonymous_page_is_cached(
+    client, news_detail_url, page_cache, django_assert_num_queries
+):
+    """Проверка повторного ответа анонимному читателю из кэша."""
+    first = client.get(news_detail_url)
+    # Единственный запрос к базе — состояние страницы для ETag.
+    with django_assert_num_queries(1):
+        second = client.get(news_detail_url)
+    assert second.content == first.content
+    assert (page_cache.hits, page_cache.misses) == (1, 1)
+
+
+def test_authorized_page_is_not_cached(
+    author_client, news_detail_url, page_cache
+):
+    """Проверка, что страницы пользователей не кэшируются."""
+    author_client.get(news_detail_url)
+    author_client.get(news_detail_url)
+    assert (page_cache.hits, page_cache.misses) == (0, 0)
+
+
+def test_comment_evicts_only_its_news(
+    client, author, news, news_detail_url, other_news_detail_url,
+    news_home_url, page_cache
+):
+    """Проверка точечного сброса кэша при новом комментарии."""
+    for url in (news_detail_url, other_news_detail_url, news_home_url):
+        client.get(url)
+    Comment.objects.create(news=news, author=author, text='Новый')
+    page_cache.reset()
+    assert 'Новый' in client.get(news_detail_url).content.decode()
+    client.get(news_home_url)
+    client.get(other_news_detail_url)
+    assert (page_cache.hits, page_cache.misses) == (1, 2)
+
+
+def test_news_change_evicts_its_page(client, news, news_detail_url):
+    """Проверка сброса кэша при изменении новости."""
+    client.get(news_detail_url)
+    news.title = 'Новый заголовок'
+    news.save()
+    assert news.title in client.get(news_detail_url).content.decode()
+
+
+@pytest.fixture
+def render_detail(rf, news):
+    """Фикстура отрисовки страницы новости без обработчика запросов."""
+    def render_detail(before_render=None):
+        request = rf.get(reverse('news:detail', args=(news.id,)))
+        request.user = AnonymousUser()
+        response = NewsDetail.as_view()(request, pk=news.id)
+        if before_render is not None:
+            before_render(response)
+        # Ответ из кэша уже отрисован.
+        return response.render() if hasattr(response, 'render') else (
+            response
+        )
+    return render_detail
+
+
+def test_late_render_does_not_restore_stale_page(
+    render_detail, news, page_cache
+):
+    """Проверка, что страница, отрисованная до сброса, не попадёт в кэш."""
+    def change_news(response):
+        News.objects.filter(pk=news.pk).update(title='Новый заголовок')
+        invalidate_news(news.pk)
+
+    render_detail(change_news)
+    content = render_detail().content.decode()
+    assert 'Новый заголовок' in content
+    assert (page_cache.hits, page_cache.misses) == (0, 2)
+
+
+def test_cached_page_keeps_headers(render_detail, page_cache):
+    """Проверка, что ответ из кэша сохраняет заголовки страницы."""
+    def set_headers(response):
+        response['Cache-Control'] = 'max-age=60'
+        response['Vary'] = 'Accept-Language'
+
+    first = render_detail(set_headers)
+    second = render_detail()
+    assert page_cache.hits == 1
+    for header in ('Cache-Control', 'Vary', 'Content-Type'):
+        assert second[header] == first[header]
+
+
+def test_cache_mixin_requires_keys():
+    """Проверка, что подкласс без ключей кэша не создаётся."""
+    with pytest.raises(ImproperlyConfigured):
+        type('Page', (AnonymousCacheMixin, generic.TemplateView), {})
+
+
+@pytest.mark.parametrize('url', (lf('news_home_url'), lf('news_detail_url')))
+def test_repeat_request_is_not_modified(
+    client, url, django_assert_max_num_queries
+):
+    """Проверка ответа 304 без отрисовки шаблона на повторный запрос."""
+    etag = client.get(url)['ETag']
+    with django_assert_max_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.templates
+
+
+def test_authorized_repeat_request_is_not_modified(
+    author_client, reader_client, news_detail_url
+):
+    """Проверка ответа 304 пользователю и только с его ETag."""
+    # Первый ответ выдаёт cookie CSRF, без которой ETag не отдаётся.
+    response = author_client.get(news_detail_url)
+    assert 'ETag' not in response
+    reader_client.get(news_detail_url)
+    response = author_client.get(news_detail_url)
+    assert 'Last-Modified' not in response
+    etag = response['ETag']
+    response = author_client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    response = reader_client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_other_process_change_changes_etag(
+    client, author, news, news_detail_url, news_home_url,
+    django_capture_on_commit_callbacks
+):
+    """
+    Проверка смены ETag после изменений, о которых кэш не знает.
+
+    Так выглядят изменения другого процесса или фоновой модерации при
+    кэше в памяти процесса: версии страниц в этом кэше не меняются.
+    """
+    etags = {url: client.get(url)['ETag'] for url in (
+        news_detail_url, news_home_url
+    )}
+    with patch('news.signals.invalidate_news'):
+        with django_capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(news=news, author=author, text='Новый')
+            News.objects.shift_comment_count(news.pk, 1)
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_relogin_gets_fresh_comment_form(
+    django_user_model, news_detail_url, users_login_url, users_logout_url,
+    django_capture_on_commit_callbacks
+):
+    """Проверка, что после нового входа форма приходит с новым CSRF-токеном."""
+    credentials = {'username': 'Гость', 'password': 'Пароль-гостя-1'}
+    django_user_model.objects.create_user(**credentials)
+    client = Client(enforce_csrf_checks=True)
+
+    def log_in():
+        token = client.get(users_login_url).context['csrf_token']
+        client.post(
+            users_login_url, {**credentials, 'csrfmiddlewaretoken': token}
+        )
+
+    log_in()
+    client.get(news_detail_url)
+    response = client.get(news_detail_url)
+    etag, old_token = response['ETag'], response.context['csrf_token']
+    client.get(users_logout_url)
+    log_in()
+    response = client.get(news_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    token = response.context['csrf_token']
+    form = {'text': 'Комментарий после входа'}
+    response = client.post(
+        news_detail_url, {**form, 'csrfmiddlewaretoken': old_token}
+    )
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            news_detail_url, {**form, 'csrfmiddlewaretoken': token}
+        )
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_missing_news_version_expires(client, news, settings):
+    """Проверка, что версия адреса без новости не хранится вечно."""
+    missing_pk = news.pk + 1
+    response = client.get(reverse('news:detail', args=(missing_pk,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    key = detail_version_key(missing_pk)
+    assert get_cache().get(key) is not None
+    expired = time() + settings.NEWS_VERSION_TIMEOUT + 1
+    with patch('django.core.cache.backends.locmem.time.time') as now:
+        now.return_value = expired
+        assert get_cache().get(key) is None
+
+
+def test_comment_changes_etag(
+    client, author_client, news_detail_url, news_home_url,
+    django_capture_on_commit_callbacks
+):
+    """Проверка смены ETag страниц новости после нового комментария."""
+    etags = {url: client.get(url)['ETag'] for url in (
+        news_detail_url, news_home_url
+    )}
+    with django_capture_on_commit_callbacks(execute=True):
+        author_client.post(news_detail_url, data={'text': 'Новый'})
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag
+
+
+def test_comment_fragment_is_cached_until_updated(
+    reader_client, comment, news_detail_url
+):
+    """Проверка кэша фрагмента комментария до изменения поля updated."""
+    reader_client.get(news_detail_url)
+    Comment.objects.filter(pk=comment.pk).update(text='Мимо кэша')
+    content = reader_client.get(news_detail_url).content.decode()
+    assert comment.text in content
+    comment.text = 'Исправленный текст'
+    comment.save()
+    content = reader_client.get(news_detail_url).content.decode()
+    assert comment.text in content
+    assert 'Редактировать' not in content
+
+
+def test_comment_fragment_uses_news_cache(
+    settings, reader_client, comment, news_detail_url
+):
+    """Проверка, что фрагмент комментария лежит в кэше NEWS_CACHE_ALIAS."""
+    settings.CACHES = {**settings.CACHES, 'news': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'news-pages',
+    }}
+    settings.NEWS_CACHE_ALIAS = 'news'
+    reader_client.get(news_detail_url)
+    key = make_template_fragment_key(
+        'comment', (comment.pk, comment.updated.isoformat())
+    )
+    assert caches['news'].get(key) is not None
+    assert caches['default'].get(key) is None
+
+
+def test_comment_fragment_timeout(
+    settings, reader_client, comment, news_detail_url
+):
+    """Проверка времени хранения фрагмента из COMMENT_FRAGMENT_TIMEOUT."""
+    settings.COMMENT_FRAGMENT_TIMEOUT = 60
+    reader_client.get(news_detail_url)
+    key = make_template_fragment_key(
+        'comment', (comment.pk, comment.updated.isoformat())
+    )
+    expired = time() + settings.COMMENT_FRAGMENT_TIMEOUT + 1
+    with patch('django.core.cache.backends.locmem.time.time') as now:
+        now.return_value = expired
+        assert get_cache().get(key) is None
+
+
+def test_author_sees_links_for_cached_fragment(
+    reader_client, author_client, comment, news_detail_url
+):
+    """Проверка, что ссылки автора не попадают в кэш фрагмента."""
+    reader_client.get(news_detail_url)
+    content = author_client.get(news_detail_url).content.decode()
+    assert 'Редактировать' in content
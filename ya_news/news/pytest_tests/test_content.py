@@ -1,11 +1,22 @@
+from http import HTTPStatus
+
 import pytest
 from django.conf import settings
+from django.template.defaultfilters import truncatewords
+from django.urls import reverse
 
 from news.forms import CommentForm
+from news.models import EXCERPT_WORDS, News
 
 
 pytestmark = pytest.mark.django_db
 
+# Состояние страницы для ETag и сам список новостей.
+HOME_PAGE_QUERIES = 2
+# Проверка существования новости и сама страница комментариев.
+COMMENTS_PAGE_QUERIES = 2
+PAGES_TO_CHECK = 3
+
 
 def test_news_count(client, news_home_url, all_news):
     """Проверка количества новостей на главной странице."""
@@ -14,6 +25,27 @@ def test_news_count(client, news_home_url, all_news):
     assert news_count == settings.NEWS_COUNT_ON_HOME_PAGE
 
 
+def test_home_page_queries_do_not_depend_on_comments(
+    client, news_home_url, crowded_news, django_assert_num_queries
+):
+    """Проверка числа запросов главной страницы при множестве комментариев."""
+    with django_assert_num_queries(HOME_PAGE_QUERIES):
+        response = client.get(news_home_url)
+    assert f'Комментариев: {crowded_news.comment_count}' in (
+        response.content.decode()
+    )
+
+
+def test_home_page_uses_excerpt(client, news_home_url, all_news):
+    """Проверка выдержки вместо полного текста на главной странице."""
+    response = client.get(news_home_url)
+    for news in response.context['object_list']:
+        assert 'text' in news.get_deferred_fields()
+        assert news.excerpt == truncatewords(
+            News.objects.get(pk=news.pk).text, EXCERPT_WORDS
+        )
+
+
 def test_news_order(client, news_home_url, all_news):
     """Проверка порядка сортировки новостей."""
     response = client.get(news_home_url)
@@ -22,17 +54,59 @@ def test_news_order(client, news_home_url, all_news):
     assert all_dates == sorted_dates
 
 
-def test_comments_order(client, news_detail_url, comments):
+def test_comments_order(client, commented_news):
     """Проверка порядка сортировки комментариев."""
-    response = client.get(news_detail_url)
+    response = client.get(reverse('news:detail', args=(commented_news.id,)))
     assert 'news' in response.context
-    news_data = response.context['news']
-    all_comments = news_data.comment_set.all()
+    all_comments = response.context['comments']
     all_timestamps = [comment.created for comment in all_comments]
     sorted_timestanps = sorted(all_timestamps)
     assert all_timestamps == sorted_timestanps
 
 
+def test_comments_are_paginated_by_cursor(
+    client, crowded_news, django_assert_num_queries
+):
+    """Проверка курсорной пагинации комментариев без OFFSET."""
+    response = client.get(reverse('news:detail', args=(crowded_news.id,)))
+    seen_ids = [comment.id for comment in response.context['comments']]
+    assert len(seen_ids) == settings.COMMENTS_PER_PAGE
+    comments_url = reverse('news:comments', args=(crowded_news.id,))
+    next_cursor = response.context['next_cursor']
+    for _ in range(PAGES_TO_CHECK):
+        with django_assert_num_queries(COMMENTS_PAGE_QUERIES) as context:
+            response = client.get(comments_url, {'after': next_cursor})
+        assert not any(
+            'OFFSET' in query['sql'] for query in context.captured_queries
+        )
+        seen_ids += [comment.id for comment in response.context['comments']]
+        next_cursor = response.context['next_cursor']
+    assert seen_ids == sorted(set(seen_ids))
+    assert len(seen_ids) == settings.COMMENTS_PER_PAGE * (PAGES_TO_CHECK + 1)
+
+
+def test_last_comments_page_has_no_cursor(client, commented_news):
+    """Проверка отсутствия курсора на последней странице."""
+    response = client.get(
+        reverse('news:comments', args=(commented_news.id,))
+    )
+    assert response.context['next_cursor'] is None
+
+
+def test_invalid_cursor(client, news):
+    """Проверка ответа на некорректный курсор."""
+    response = client.get(
+        reverse('news:comments', args=(news.id,)), {'after': 'мусор'}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_comments_of_missing_news(client, news):
+    """Проверка ответа 404 на комментарии несуществующей новости."""
+    response = client.get(reverse('news:comments', args=(news.id + 1,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
 def test_anonymous_client_has_no_form(client, news_detail_url):
     """Проверка формы комментария для анонимного пользователя."""
     response = client.get(news_detail_url)
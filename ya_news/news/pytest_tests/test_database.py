@@ -0,0 +1,54 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.db import connections
+
+from django_testing_common.db_snapshot import snapshot_key, work_path
+
+
+PRAGMAS = {'cache_size': -1234, 'busy_timeout': 4321}
+
+
+@pytest.mark.django_db
+def test_new_connection_gets_pragmas(settings):
+    """Проверка настройки нового соединения по SQLITE_PRAGMAS."""
+    settings.SQLITE_PRAGMAS = PRAGMAS
+    connection = connections.create_connection('default')
+    try:
+        with connection.cursor() as cursor:
+            for name, value in PRAGMAS.items():
+                cursor.execute(f'PRAGMA {name}')
+                assert cursor.fetchone()[0] == value
+    finally:
+        connection.close()
+
+
+def test_snapshot_key_follows_migrations():
+    """Проверка смены снимка при изменении файла миграции."""
+    connection = connections['default']
+    key = snapshot_key(connection)
+    assert snapshot_key(connection) == key
+    read_bytes = Path.read_bytes
+
+    def edited(path):
+        content = read_bytes(path)
+        if path.name == '0001_initial.py':
+            content += b'\n# edited\n'
+        return content
+
+    with patch.object(Path, 'read_bytes', edited):
+        assert snapshot_key(connection) != key
+
+
+@pytest.mark.django_db
+def test_database_is_restored_from_snapshot():
+    """Проверка, что тестовая база — мигрированный рабочий файл процесса."""
+    connection = connections['default']
+    assert connection.settings_dict['NAME'] == str(work_path())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT COUNT(*) FROM django_migrations WHERE app = %s',
+            ('news',)
+        )
+        assert cursor.fetchone()[0] > 0
@@ -1,14 +1,23 @@
 from http import HTTPStatus
+from io import StringIO
 from random import choice
+from unittest.mock import patch
 
 import pytest
+from django.core.management import call_command
 from pytest_django.asserts import assertRedirects, assertFormError
+from pytest_lazyfixture import lazy_fixture as lf
 
 from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.models import Comment, News
+from news.views import CommentUpdate
 
 
 NEW_COMMENT = {'text': 'Обновлённый комментарий'}
+# Сессия и пользователь, объект для проверки прав и сама запись.
+WRITE_QUERIES = 4
+# Счётчик комментариев новости и точка сохранения вокруг записи.
+COUNTER_QUERIES = 3
 
 
 @pytest.mark.django_db
@@ -80,6 +89,24 @@ def test_author_can_edit_comment(
     assert comment.author == author
 
 
+def test_edit_keeps_moderation_decision(
+    author_client, comment, news, news_edit_url
+):
+    """Проверка правки, которую опередила модерация комментария."""
+    stale = Comment.objects.get(pk=comment.pk)
+    Comment.objects.filter(pk=comment.pk).update(
+        status=Comment.Status.REJECTED
+    )
+    News.objects.filter(pk=news.pk).recount_comments()
+    with patch.object(CommentUpdate, 'get_object', return_value=stale):
+        author_client.post(news_edit_url, NEW_COMMENT)
+    comment.refresh_from_db()
+    assert comment.text == NEW_COMMENT['text']
+    assert comment.status == Comment.Status.REJECTED
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
 def test_user_cant_edit_comment_of_another_user(
     reader_client, reader, news_edit_url, comment
 ):
@@ -90,3 +117,57 @@ def test_user_cant_edit_comment_of_another_user(
     assert comment.text == comment_from_db.text
     assert comment.author == comment_from_db.author
     assert comment.news == comment_from_db.news
+
+
+@pytest.mark.parametrize(
+    'url, queries',
+    (
+        (lf('news_detail_url'), WRITE_QUERIES + COUNTER_QUERIES),
+        # Правка не меняет статус и поэтому не трогает счётчик.
+        (lf('news_edit_url'), WRITE_QUERIES),
+        (lf('news_delete_url'), WRITE_QUERIES + COUNTER_QUERIES),
+    )
+)
+def test_comment_write_queries(
+    author_client, news_detail_url, url, queries, django_assert_num_queries
+):
+    """Проверка числа запросов при создании, правке и удалении комментария."""
+    with django_assert_num_queries(queries):
+        response = author_client.post(url, data=NEW_COMMENT)
+    assertRedirects(
+        response, f'{news_detail_url}#comments', fetch_redirect_response=False
+    )
+
+
+def test_comment_count_follows_comments(
+    author_client, news, news_detail_url, news_delete_url
+):
+    """Проверка счётчика комментариев при создании и удалении."""
+    author_client.post(news_detail_url, data=NEW_COMMENT)
+    news.refresh_from_db()
+    assert news.comment_count == 2
+    author_client.post(news_delete_url)
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_news_save_keeps_comment_count(news, comment):
+    """Проверка, что сохранение новости не затирает счётчик."""
+    stale = News.objects.get(pk=news.pk)
+    News.objects.shift_comment_count(news.pk, 1)
+    stale.title = 'Новый заголовок'
+    stale.save()
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+
+@pytest.mark.django_db
+def test_reconcile_fixes_drifted_counts(news, comment):
+    """Проверка исправления разошедшегося счётчика командой."""
+    News.objects.filter(pk=news.pk).update(comment_count=10)
+    out = StringIO()
+    call_command('reconcile_comment_counts', stdout=out)
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    assert out.getvalue().strip().endswith('1')
@@ -0,0 +1,156 @@
+import json
+import threading
+from http import HTTPStatus
+from time import sleep
+
+import pytest
+from django.test.client import Client
+from django.urls import reverse
+from pytest_lazyfixture import lazy_fixture as lf
+
+from django_testing_common.metrics import (
+    FileStore, Registry, collect, registry
+)
+
+pytestmark = pytest.mark.django_db
+
+THREADS = 8
+INCREMENTS = 1000
+SCRAPER_IP = '10.0.0.9'
+
+
+@pytest.fixture(autouse=True)
+def clean_registry(settings):
+    """Фикстура пустых метрик процесса с включённой страницей /metrics."""
+    settings.METRICS_ENABLED = True
+    settings.METRICS_ALLOWED_IPS = [SCRAPER_IP]
+    registry.reset()
+
+
+@pytest.fixture
+def scraper():
+    """Фикстура клиента с адреса из METRICS_ALLOWED_IPS."""
+    return Client(REMOTE_ADDR=SCRAPER_IP)
+
+
+@pytest.fixture
+def metrics_url():
+    """Фикстура url метрик."""
+    return reverse('metrics')
+
+
+def test_request_metrics(scraper, news_detail_url, metrics_url):
+    """Проверка счётчика и гистограмм запросов по маршруту."""
+    scraper.get(news_detail_url)
+    lines = scraper.get(metrics_url).content.decode().splitlines()
+    assert (
+        'http_requests_total{route="news:detail",method="GET",'
+        'status="200"} 1'
+    ) in lines
+    assert 'http_request_duration_seconds_count{route="news:detail"} 1' in (
+        lines
+    )
+    assert (
+        'http_request_queries_bucket{route="news:detail",le="+Inf"} 1'
+    ) in lines
+
+
+def test_cache_hit_ratio(scraper, news_detail_url, metrics_url):
+    """Проверка доли попаданий в кэш страниц."""
+    scraper.get(news_detail_url)
+    scraper.get(news_detail_url)
+    content = scraper.get(metrics_url).content.decode()
+    assert 'cache_hit_ratio{cache="news_pages"} 0.5' in content
+
+
+@pytest.mark.parametrize(
+    'parametrized_client, status',
+    (
+        (lf('client'), HTTPStatus.FORBIDDEN),
+        (lf('author_client'), HTTPStatus.FORBIDDEN),
+        (lf('admin_client'), HTTPStatus.OK),
+        (lf('scraper'), HTTPStatus.OK),
+    )
+)
+def test_metrics_access(parametrized_client, status, metrics_url):
+    """Проверка доступа к метрикам сотрудников и разрешённых адресов."""
+    assert parametrized_client.get(metrics_url).status_code == status
+
+
+def test_metrics_are_off_by_default(settings, scraper, metrics_url):
+    """Проверка, что без METRICS_ENABLED страницы метрик нет."""
+    settings.METRICS_ENABLED = False
+    assert scraper.get(metrics_url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_thread_shards_are_summed():
+    """Проверка суммы счётчиков, записанных из разных потоков."""
+    local_registry = Registry()
+    labels = (('route', 'news:home'),)
+
+    def work():
+        for _ in range(INCREMENTS):
+            local_registry.inc('http_requests_total', labels)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    samples = local_registry.samples()
+    assert samples[('http_requests_total', labels)] == THREADS * INCREMENTS
+
+
+def test_finished_thread_shards_are_retired():
+    """Проверка, что словари завершившихся потоков не копятся."""
+    local_registry = Registry()
+    labels = (('route', 'news:home'),)
+    for _ in range(THREADS * 10):
+        thread = threading.Thread(
+            target=local_registry.inc, args=('http_requests_total', labels)
+        )
+        thread.start()
+        thread.join()
+    local_registry.inc('http_requests_total', labels)
+    assert len(local_registry._shards) <= 2
+    samples = local_registry.samples()
+    assert samples[('http_requests_total', labels)] == THREADS * 10 + 1
+    assert len(local_registry._shards) == 1
+
+
+def test_file_store_sums_processes(settings, tmp_path, client, news_home_url):
+    """Проверка сложения метрик других процессов из METRICS_DIR."""
+    settings.METRICS_DIR = str(tmp_path)
+    labels = [['route', 'news:home'], ['method', 'GET'], ['status', 200]]
+    (tmp_path / '0.json').write_text(
+        json.dumps([['http_requests_total', labels, 2]])
+    )
+    client.get(news_home_url)
+    samples = collect()
+    assert samples[
+        ('http_requests_total', tuple(map(tuple, labels)))
+    ] == 3
+
+
+def test_concurrent_flush_writes_once(settings, tmp_path):
+    """Проверка, что одновременный сброс метрик пишет файл один раз."""
+    settings.METRICS_FLUSH_INTERVAL = 60
+    file_store = FileStore(tmp_path)
+    barrier = threading.Barrier(THREADS)
+    calls = []
+
+    def samples():
+        calls.append(1)
+        sleep(0.05)
+        return {}
+
+    def work():
+        barrier.wait()
+        file_store.maybe_write(samples)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
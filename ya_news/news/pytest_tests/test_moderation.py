@@ -0,0 +1,183 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from pytest_django.asserts import assertRedirects
+
+from news.forms import WARNING, CommentForm, get_bad_words_matcher
+from news.management.commands.moderate_comments import make_executor
+from news.matcher import ReloadingMatcher, WordMatcher
+from news.models import Comment, News
+
+
+WORDS = ('редиска', 'негодяй', 'he', 'she', 'hers')
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    (
+        ('Какой-то текст, Редиска, ещё текст', 'редиска'),
+        ('вы негодяйка', 'негодяй'),
+        ('ushers', 'she'),
+        ('просто текст', None),
+        ('', None),
+    )
+)
+def test_matcher_finds_words(text, expected):
+    """Проверка поиска слов автоматом Ахо — Корасик."""
+    assert WordMatcher(WORDS).find(text) == expected
+
+
+def test_matcher_agrees_with_substring_search():
+    """Проверка совпадения с построчным поиском подстрок."""
+    matcher = WordMatcher(WORDS)
+    for text in ('hershey', 'негодяйка', 'редис', 'ничего'):
+        found = any(word in text for word in WORDS)
+        assert (matcher.find(text) is not None) is found
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    (
+        ('ты редиска!', 'редиска'),
+        ('редиска', 'редиска'),
+        ('редисками', None),
+        ('негодяйка', None),
+    )
+)
+def test_matcher_word_boundary(text, expected):
+    """Проверка поиска только целых слов."""
+    assert WordMatcher(WORDS, word_boundary=True).find(text) == expected
+
+
+def test_matcher_homoglyphs():
+    """Проверка подмены кириллических букв латинскими."""
+    text = 'ты pедиcкa'
+    assert WordMatcher(WORDS).find(text) is None
+    assert WordMatcher(WORDS, homoglyphs=True).find(text) == 'редиска'
+
+
+@pytest.fixture
+def words_file(tmp_path):
+    """Фикстура файла словаря стоп-слов."""
+    path = tmp_path / 'bad_words.txt'
+    path.write_text('# словарь\nредиска\n', encoding='utf-8')
+    return path
+
+
+def rewrite(path, text):
+    """Перезаписывает файл и сдвигает время его изменения."""
+    if isinstance(text, bytes):
+        path.write_bytes(text)
+    else:
+        path.write_text(text, encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_dictionary_is_reloaded(words_file):
+    """Проверка перечитывания изменённого словаря."""
+    matcher = ReloadingMatcher(words_file, check_interval=0)
+    assert matcher.find('редиска') == 'редиска'
+    rewrite(words_file, 'негодяй\n')
+    assert matcher.find('редиска') is None
+    assert matcher.find('негодяй') == 'негодяй'
+
+
+def test_dictionary_is_checked_once_per_interval(words_file):
+    """Проверка, что файл не проверяется чаще заданного интервала."""
+    matcher = ReloadingMatcher(words_file, check_interval=3600)
+    rewrite(words_file, 'негодяй\n')
+    assert matcher.find('негодяй') is None
+
+
+def test_broken_dictionary_keeps_previous_words(words_file, caplog):
+    """Проверка прежнего словаря, если файл не читается как UTF-8."""
+    matcher = ReloadingMatcher(words_file, check_interval=0)
+    rewrite(words_file, 'негодяй\n'.encode('cp1251'))
+    with caplog.at_level(logging.WARNING, logger='news.matcher'):
+        assert matcher.find('редиска') == 'редиска'
+        assert matcher.find('редиска') == 'редиска'
+    assert len(caplog.records) == 1
+    rewrite(words_file, 'негодяй\n')
+    assert matcher.find('негодяй') == 'негодяй'
+
+
+def test_missing_dictionary_keeps_default_words(tmp_path):
+    """Проверка словаря по умолчанию при отсутствии файла."""
+    matcher = ReloadingMatcher(
+        tmp_path / 'missing.txt', check_interval=0, default_words=WORDS
+    )
+    assert matcher.find('редиска') == 'редиска'
+
+
+@pytest.mark.django_db
+def test_form_uses_dictionary_file(words_file, settings):
+    """Проверка формы со словарём из файла."""
+    settings.BAD_WORDS_FILE = words_file
+    get_bad_words_matcher.cache_clear()
+    try:
+        rewrite(words_file, 'кабачок\n')
+        assert not CommentForm({'text': 'ты кабачок'}).is_valid()
+    finally:
+        get_bad_words_matcher.cache_clear()
+
+
+@pytest.fixture
+def async_moderation(settings):
+    """Фикстура асинхронного режима модерации."""
+    settings.COMMENT_MODERATION_ASYNC = True
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('pool', ('thread', 'process'))
+def test_pending_comments_are_moderated(
+    async_moderation, reader_client, news_detail_url, pool
+):
+    """Проверка публикации и отклонения комментариев обработчиком."""
+    for text in ('Хорошая новость', 'Какой-то негодяй'):
+        response = reader_client.post(news_detail_url, data={'text': text})
+        assertRedirects(response, f'{news_detail_url}#comments')
+    assert set(
+        Comment.objects.values_list('status', flat=True)
+    ) == {Comment.Status.PENDING}
+    assert not reader_client.get(news_detail_url).context['comments']
+    call_command('moderate_comments', pool=pool, stdout=StringIO())
+    statuses = dict(Comment.objects.values_list('text', 'status'))
+    assert statuses == {
+        'Хорошая новость': Comment.Status.PUBLISHED,
+        'Какой-то негодяй': Comment.Status.REJECTED,
+    }
+    comments = reader_client.get(news_detail_url).context['comments']
+    assert [comment.text for comment in comments] == ['Хорошая новость']
+    assert News.objects.get().comment_count == 1
+
+
+@pytest.mark.django_db
+def test_edit_is_not_moderated_again(
+    async_moderation, author_client, comment, news_edit_url
+):
+    """Проверка правки опубликованного комментария в асинхронном режиме."""
+    author_client.post(news_edit_url, data={'text': 'Новый текст'})
+    comment.refresh_from_db()
+    assert comment.text == 'Новый текст'
+    assert comment.status == Comment.Status.PUBLISHED
+    response = author_client.post(news_edit_url, data={'text': 'Ты негодяй'})
+    assert response.context['form'].errors['text'] == [WARNING]
+
+
+@pytest.mark.parametrize('start_methods, executor_class', (
+    (['fork', 'spawn'], ProcessPoolExecutor),
+    (['spawn'], ThreadPoolExecutor),
+))
+def test_process_pool_requires_fork(start_methods, executor_class):
+    """Проверка отказа от пула процессов там, где нет fork."""
+    with patch(
+        'multiprocessing.get_all_start_methods', return_value=start_methods
+    ):
+        with make_executor('process', 1) as executor:
+            assert isinstance(executor, executor_class)
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.utils import ConnectionDoesNotExist
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from news.models import News
+from news.routers import (
+    PIN_COOKIE, PrimaryPinMiddleware, ReplicaRouter, is_pinned, primary
+)
+from news.search import get_index
+
+REPLICA = 'replica_0'
+
+
+@pytest.fixture
+def replicas(settings):
+    """Фикстура настроек с одной репликой для чтения."""
+    settings.DATABASE_REPLICAS = [REPLICA]
+
+
+def routed_read(request, status=HTTPStatus.OK):
+    """Пропускает запрос через middleware и возвращает базу для чтения."""
+    databases = []
+
+    def view(request):
+        databases.append(ReplicaRouter().db_for_read(News))
+        return HttpResponse(status=status)
+
+    response = PrimaryPinMiddleware(view)(request)
+    return databases[0], response
+
+
+def test_without_replicas_reads_go_to_primary():
+    """Проверка, что без реплик всё читается из основной базы."""
+    assert ReplicaRouter().db_for_read(News) == 'default'
+
+
+@pytest.mark.parametrize(
+    'method, cookies, database',
+    (
+        ('get', {}, REPLICA),
+        ('get', {PIN_COOKIE: '1'}, 'default'),
+        ('post', {}, 'default'),
+    )
+)
+def test_read_routing(replicas, method, cookies, database):
+    """Проверка выбора базы для чтения в зависимости от запроса."""
+    request = getattr(RequestFactory(), method)('/')
+    request.COOKIES.update(cookies)
+    assert routed_read(request)[0] == database
+    assert ReplicaRouter().db_for_read(News) == REPLICA
+    assert ReplicaRouter().db_for_write(News) == 'default'
+
+
+def test_write_pins_next_requests(replicas):
+    """Проверка cookie, которое закрепляет автора за основной базой."""
+    _, response = routed_read(RequestFactory().post('/'))
+    assert response.cookies[PIN_COOKIE]['max-age'] > 0
+
+
+def test_failed_write_does_not_pin(replicas):
+    """Проверка, что отклонённый запрос не закрепляет автора."""
+    _, response = routed_read(
+        RequestFactory().post('/'), HTTPStatus.BAD_REQUEST
+    )
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_primary_restores_previous_pin():
+    """Проверка вложенного закрепления за основной базой."""
+    with primary():
+        with primary():
+            assert is_pinned()
+        assert is_pinned()
+    assert not is_pinned()
+
+
+@pytest.mark.django_db
+def test_search_follows_router(replicas):
+    """Проверка, что поиск читает из базы, выбранной роутером."""
+    get_index.cache_clear()
+    try:
+        with pytest.raises(ConnectionDoesNotExist):
+            get_index().search('новость', 0, 1)
+        with primary():
+            get_index().search('новость', 0, 1)
+    finally:
+        get_index.cache_clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'command', ('reconcile_comment_counts', 'rebuild_search_index')
+)
+def test_commands_use_primary(replicas, command):
+    """Проверка, что служебные команды не читают с реплики."""
+    call_command(command, stdout=StringIO())
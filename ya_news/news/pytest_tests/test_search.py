@@ -0,0 +1,83 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.models import News
+from news.search import get_index
+
+
+pytestmark = pytest.mark.django_db
+
+SEARCH_URL = reverse('news:search')
+
+
+@pytest.fixture(params=('fts5', 'memory'))
+def search_backend(request, settings):
+    """Фикстура поиска поочерёдно на обоих бэкендах."""
+    settings.NEWS_SEARCH_BACKEND = request.param
+    get_index.cache_clear()
+    yield request.param
+    get_index.cache_clear()
+
+
+def found_titles(client, query, page=1):
+    response = client.get(SEARCH_URL, {'q': query, 'page': page})
+    return [news.title for news in response.context['object_list']]
+
+
+def test_title_match_ranks_higher(client, search_backend):
+    """Проверка, что совпадение в заголовке важнее совпадения в тексте."""
+    News.objects.create(title='Погода', text='Над космодромом ясно, космос')
+    News.objects.create(title='Космос', text='Новости науки')
+    News.objects.create(title='Спорт', text='Футбол')
+    assert found_titles(client, 'КОСМОС') == ['Космос', 'Погода']
+
+
+def test_all_words_must_match(client, search_backend):
+    """Проверка поиска новостей, содержащих все слова запроса."""
+    News.objects.create(title='Первая', text='кошка и собака')
+    News.objects.create(title='Вторая', text='только кошка')
+    assert found_titles(client, 'собака кошка') == ['Первая']
+
+
+def test_results_are_paginated(client, search_backend):
+    """Проверка постраничного вывода результатов."""
+    extra = 2
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='общий текст')
+        for index in range(settings.SEARCH_RESULTS_PER_PAGE + extra)
+    )
+    call_command('rebuild_search_index', stdout=StringIO())
+    response = client.get(SEARCH_URL, {'q': 'общий'})
+    assert len(response.context['object_list']) == (
+        settings.SEARCH_RESULTS_PER_PAGE
+    )
+    assert response.context['has_next']
+    assert len(found_titles(client, 'общий', page=2)) == extra
+
+
+def test_index_follows_changes(
+    client, search_backend, django_capture_on_commit_callbacks
+):
+    """Проверка обновления индекса при изменении и удалении новости."""
+    news = News.objects.create(title='Старый', text='текст')
+    assert found_titles(client, 'старый') == ['Старый']
+    with django_capture_on_commit_callbacks(execute=True):
+        news.title = 'Новый'
+        news.save()
+    assert found_titles(client, 'старый') == []
+    assert found_titles(client, 'новый') == ['Новый']
+    with django_capture_on_commit_callbacks(execute=True):
+        news.delete()
+    assert found_titles(client, 'новый') == []
+
+
+@pytest.mark.parametrize('page', ('0', 'abc', '²'))
+def test_invalid_page(client, page):
+    """Проверка ответа на некорректный номер страницы."""
+    response = client.get(SEARCH_URL, {'q': 'текст', 'page': page})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def request_timing(settings):
+    """Фикстура включённых замеров запросов."""
+    settings.REQUEST_TIMING = True
+
+
+def test_timing_disabled_by_default(client, news_home_url):
+    """Проверка, что без настройки замеров нет."""
+    response = client.get(news_home_url)
+    assert 'Server-Timing' not in response
+    assert not hasattr(response, 'timings')
+
+
+def test_server_timing_header(request_timing, client, news_detail_url):
+    """Проверка заголовка Server-Timing на странице новости."""
+    response = client.get(news_detail_url)
+    metrics = [
+        metric.split(';')[0] for metric in
+        response['Server-Timing'].split(', ')
+    ]
+    assert metrics == ['db', 'render', 'total']
+    assert response.timings.render > 0
+    assert response.timings.total >= response.timings.render
+
+
+def test_timings_count_queries(
+    request_timing, author_client, news_detail_url
+):
+    """Проверка, что замеры учитывают все SQL-запросы страницы."""
+    with CaptureQueriesContext(connection) as queries:
+        response = author_client.get(news_detail_url)
+    assert response.timings.queries == len(queries) > 0
+
+
+def test_timing_log_line(request_timing, client, news_home_url, caplog):
+    """Проверка строки лога с замерами запроса."""
+    with caplog.at_level(logging.INFO, logger='django_testing_common.timing'):
+        response = client.get(news_home_url)
+    record, = caplog.records
+    assert record.path == news_home_url
+    assert record.queries == response.timings.queries
+    assert f'path={news_home_url} status=200' in record.getMessage()
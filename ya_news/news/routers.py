@@ -0,0 +1,79 @@
+import random
+import threading
+from contextlib import contextmanager
+from http import HTTPStatus
+
+from django.conf import settings
+
+PIN_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = threading.local()
+
+
+def pin_primary(pinned=True):
+    """Чтения текущего потока идут в основную базу, пока флаг включён."""
+    _state.pinned = pinned
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+@contextmanager
+def primary(pinned=True):
+    """Закрепляет чтения потока за основной базой на время блока."""
+    previous = is_pinned()
+    pin_primary(pinned)
+    try:
+        yield
+    finally:
+        pin_primary(previous)
+
+
+class ReplicaRouter:
+    """
+    Чтения уходят на одну из реплик DATABASE_REPLICAS, записи — в default.
+
+    Реплики содержат те же таблицы, поэтому связи между объектами из
+    разных соединений разрешены, а миграции применяются только к default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if is_pinned() or not settings.DATABASE_REPLICAS:
+            return 'default'
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class PrimaryPinMiddleware:
+    """
+    Закрепляет запросы пользователя за основной базой после записи.
+
+    Запросы с изменяющими методами читают из основной базы. Успешный
+    такой запрос ставит cookie на REPLICA_PIN_SECONDS, поэтому следующий
+    запрос автора не попадёт на реплику, которая ещё не получила его
+    изменения. Отклонённый запрос ничего не записал, и cookie не нужен.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writing = request.method not in SAFE_METHODS
+        with primary(writing or PIN_COOKIE in request.COOKIES):
+            response = self.get_response(request)
+        if writing and response.status_code < HTTPStatus.BAD_REQUEST:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
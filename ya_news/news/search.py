@@ -0,0 +1,20 @@
+from functools import lru_cache
+
+from django.conf import settings
+
+from django_testing_common.search import make_index
+
+from .models import News
+
+TABLE = 'news_search'
+
+
+@lru_cache(maxsize=None)
+def get_index():
+    """Бэкенд поиска задаётся настройкой NEWS_SEARCH_BACKEND."""
+    return make_index(News, TABLE, settings.NEWS_SEARCH_BACKEND)
+
+
+def search_page(query, page, per_page):
+    """Id новостей страницы результатов и признак следующей страницы."""
+    return get_index().page(query, page, per_page)
@@ -0,0 +1,71 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_migrate
+)
+from django.dispatch import receiver
+
+from django_testing_common.sqlite import apply_sqlite_pragmas
+from .cache import invalidate_news
+from .models import Comment, CommentChange, News
+from .routers import pin_primary
+from .search import get_index
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def log_comment_change(sender, instance, **kwargs):
+    """
+    Изменение комментария попадает в журнал ленты изменений.
+
+    Новый комментарий на модерации читатели ещё не видят, поэтому
+    в журнал он попадёт только после публикации. Приёмник объявлен
+    раньше сброса кэша, чтобы запись журнала появилась до смены версии
+    страницы, которую ждут клиенты ленты.
+    """
+    if kwargs.get('created') and (
+        instance.status != Comment.Status.PUBLISHED
+    ):
+        return
+    CommentChange.objects.log([(instance.news_id, instance.pk)])
+
+
+@receiver((post_save, post_delete), sender=News)
+def news_changed(sender, instance, **kwargs):
+    """Сбрасываем кэш страниц изменённой новости."""
+    invalidate_news(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    """Сбрасываем кэш страниц новости, к которой относится комментарий."""
+    invalidate_news(instance.news_id)
+
+
+@receiver(post_save, sender=News)
+def index_news(sender, instance, update_fields=None, **kwargs):
+    """Обновляем поисковый индекс, если изменился заголовок или текст."""
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        get_index().update(instance)
+
+
+@receiver(post_delete, sender=News)
+def unindex_news(sender, instance, **kwargs):
+    get_index().remove(instance.pk)
+
+
+@receiver(pre_migrate)
+def pin_migrations(sender, **kwargs):
+    """
+    Миграции читают данные из основной базы.
+
+    Миграции применяются только к default, а у реплики новых таблиц
+    ещё нет, поэтому RunPython без using() не должен уходить на неё.
+    """
+    pin_primary()
+
+
+@receiver(post_migrate)
+def unpin_migrations(sender, **kwargs):
+    pin_primary(False)
+
+
+connection_created.connect(apply_sqlite_pragmas)
@@ -1,47 +1,144 @@
+from time import monotonic, sleep
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.core.exceptions import BadRequest
+from django.db import transaction
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import generic
 
+from .cache import (
+    AnonymousCacheMixin, conditional_page, detail_key, detail_validator,
+    detail_version_key, home_key, home_validator, home_version_key
+)
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import CHANGE_FIELDS, get_comment_changes, get_comments_page
+from .search import search_page
+
+INVALID_PAGE = 'Некорректный номер страницы.'
+INVALID_WAIT = 'Некорректное время ожидания.'
 
 
-class NewsList(generic.ListView):
+@method_decorator(conditional_page(home_validator), name='get')
+class NewsList(AnonymousCacheMixin, generic.ListView):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
+    page_key = staticmethod(home_key)
+    version_key = staticmethod(home_version_key)
 
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Число комментариев хранится в самой новости, а вместо
+        полного текста загружается сохранённая выдержка.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
+        return self.model.objects.defer(
+            'text'
         )[:settings.NEWS_COUNT_ON_HOME_PAGE]
 
 
-class NewsDetail(generic.DetailView):
-    model = News
-    template_name = 'news/detail.html'
+class NewsSearch(generic.ListView):
+    """Полнотекстовый поиск по новостям."""
+    template_name = 'news/search.html'
+
+    def get_queryset(self):
+        """Новости страницы результатов в порядке релевантности."""
+        self.query = self.request.GET.get('q', '').strip()
+        try:
+            self.page = int(self.request.GET.get('page', '1'))
+        except ValueError:
+            raise BadRequest(INVALID_PAGE)
+        if self.page < 1:
+            raise BadRequest(INVALID_PAGE)
+        ids, self.has_next = search_page(
+            self.query, self.page, settings.SEARCH_RESULTS_PER_PAGE
+        )
+        found = News.objects.defer('text').in_bulk(ids)
+        return [found[pk] for pk in ids if pk in found]
 
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(
+            query=self.query, page=self.page, has_next=self.has_next
         )
-        return obj
+        return context
+
+
+class NewsDetail(AnonymousCacheMixin, generic.DetailView):
+    model = News
+    template_name = 'news/detail.html'
+    page_key = staticmethod(detail_key)
+    version_key = staticmethod(detail_version_key)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = get_comments_page(
+            self.object.pk, self.request.GET.get('after')
+        )
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
         return context
 
 
+class CommentsPage(generic.TemplateView):
+    """Следующая страница комментариев новости без остальной страницы."""
+    template_name = 'news/comments.html'
+
+    def get_context_data(self, **kwargs):
+        """Для несуществующей новости ответ 404, а не пустой список."""
+        if not News.objects.filter(pk=self.kwargs['pk']).exists():
+            raise Http404
+        context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = get_comments_page(
+            self.kwargs['pk'], self.request.GET.get('after')
+        )
+        return context
+
+
+class CommentsChanges(generic.View):
+    """
+    Комментарии новости, изменённые после курсора, в формате JSON.
+
+    В removed приходят id комментариев, которые удалены или сняты
+    с публикации; клиент убирает их, если показывал.
+    """
+
+    def get(self, request, pk):
+        """
+        С параметром wait ответ ждёт изменений до wait секунд.
+
+        Пока изменений нет, журнал изменений новости проверяется раз
+        в COMMENTS_POLL_INTERVAL секунд одним запросом по индексу. Журнал
+        пишут все процессы, включая фоновую модерацию, поэтому ожидание
+        не зависит от кэша этого процесса.
+        """
+        try:
+            wait = int(request.GET.get('wait', '0'))
+        except ValueError:
+            raise BadRequest(INVALID_WAIT)
+        if wait < 0:
+            raise BadRequest(INVALID_WAIT)
+        deadline = monotonic() + min(wait, settings.COMMENTS_POLL_TIMEOUT)
+        since = request.GET.get('since')
+        rows, removed, cursor, has_more = get_comment_changes(pk, since)
+        while cursor == since and monotonic() < deadline:
+            sleep(settings.COMMENTS_POLL_INTERVAL)
+            rows, removed, cursor, has_more = get_comment_changes(pk, since)
+        return JsonResponse({
+            'fields': list(CHANGE_FIELDS),
+            'comments': rows,
+            'removed': removed,
+            'since': cursor,
+            'has_more': has_more,
+        })
+
+
 class NewsComment(
         LoginRequiredMixin,
         generic.detail.SingleObjectMixin,
@@ -56,19 +153,31 @@ class NewsComment(
         return super().post(request, *args, **kwargs)
 
     def form_valid(self, form):
+        """
+        В асинхронном режиме комментарий ждёт фоновой модерации.
+
+        Опубликованный комментарий сразу учитывается в счётчике.
+        """
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        if settings.COMMENT_MODERATION_ASYNC:
+            comment.status = Comment.Status.PENDING
+        with transaction.atomic():
+            comment.save()
+            if comment.status == Comment.Status.PUBLISHED:
+                News.objects.shift_comment_count(self.object.pk, 1)
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
 
+    @method_decorator(conditional_page(detail_validator))
     def get(self, request, *args, **kwargs):
         view = NewsDetail.as_view()
         return view(request, *args, **kwargs)
@@ -83,9 +192,9 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """Адрес новости берём из уже загруженного комментария."""
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
@@ -98,7 +207,26 @@ class CommentUpdate(CommentBase, generic.UpdateView):
     template_name = 'news/edit.html'
     form_class = CommentForm
 
+    def form_valid(self, form):
+        """
+        Правка записывает только текст.
+
+        Статус, прочитанный до правки, мог уже смениться модерацией,
+        и полная запись вернула бы его поверх её решения. Правка статус
+        не меняет, поэтому и счётчик комментариев не трогает.
+        """
+        self.object = form.save(commit=False)
+        self.object.save(update_fields=('text', 'updated'))
+        return HttpResponseRedirect(self.get_success_url())
+
 
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+    def delete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            if self.object.status == Comment.Status.PUBLISHED:
+                News.objects.shift_comment_count(self.object.news_id, -1)
+        return response
@@ -1,7 +1,13 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
 
+from django_testing_common.settings import (  # noqa: F401
+    LOGGING, METRICS_ALLOWED_IPS, METRICS_DIR, METRICS_ENABLED,
+    METRICS_FLUSH_INTERVAL, REQUEST_TIMING
+)
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+('
@@ -21,7 +27,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_testing_common.timing.RequestTimingMiddleware',
+    'django_testing_common.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'news.routers.PrimaryPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -43,6 +52,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'news.context_processors.news_cache',
             ],
         },
     },
@@ -58,6 +68,50 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения перечисляются через запятую в DATABASE_REPLICAS
+# путями к файлам SQLite. В тестах они зеркалируют базу default.
+DATABASE_REPLICAS = []
+
+for path in filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')):
+    alias = f'replica_{len(DATABASE_REPLICAS)}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['news.routers.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает из основной базы.
+REPLICA_PIN_SECONDS = 10
+
+# Профиль базы данных выбирается переменной окружения DATABASE_PROFILE.
+# В профиле production соединения живут между запросами, а SQLite
+# работает в режиме WAL, где читатели не ждут пишущую транзакцию.
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'development')
+
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite.
+SQLITE_PRAGMAS = {}
+
+if DATABASE_PROFILE == 'production':
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 600
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+    }
+
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +134,43 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_PER_PAGE = 20
+
+# Наибольшее время ожидания новых комментариев в ленте изменений
+# и интервал проверки журнала изменений, в секундах.
+COMMENTS_POLL_TIMEOUT = 25
+
+COMMENTS_POLL_INTERVAL = 0.5
+
+# Сколько дней хранятся записи журнала изменений комментариев.
+COMMENT_CHANGES_RETENTION_DAYS = 7
+
+NEWS_CACHE_ALIAS = 'default'
+
+NEWS_CACHE_TIMEOUT = 300
+
+# Версии страниц живут дольше самих страниц, но не бессрочно: версия
+# создаётся и для адреса несуществующей новости.
+NEWS_VERSION_TIMEOUT = 24 * 60 * 60
+
+# Фрагмент комментария меняет ключ вместе с полем updated, поэтому
+# хранится дольше страниц.
+COMMENT_FRAGMENT_TIMEOUT = 24 * 60 * 60
+
+BAD_WORDS_WORD_BOUNDARY = False
+
+BAD_WORDS_HOMOGLYPHS = False
+
+BAD_WORDS_FILE = os.getenv('BAD_WORDS_FILE')
+
+BAD_WORDS_RELOAD_INTERVAL = 5
+
+COMMENT_MODERATION_ASYNC = os.getenv('COMMENT_MODERATION_ASYNC') == '1'
+
+NEWS_SEARCH_BACKEND = 'auto'
+
+SEARCH_RESULTS_PER_PAGE = 10
+
+# Источник обращений к кэшу для /metrics.
+METRICS_CACHE_STATS = 'news.metrics.cache_samples'
@@ -0,0 +1,25 @@
+"""
+Скрипты замера производительности YaNote.
+
+Запускаются из каталога ya_note как модули, например:
+    python -m benchmarks.index_plans
+"""
+import os
+from time import perf_counter
+
+
+def setup_django(db_path):
+    """Настраивает Django на отдельный файл базы данных для замеров."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    import django
+    django.setup()
+
+
+def timeit(func, repeat):
+    """Среднее время одного вызова функции в миллисекундах."""
+    started = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - started) / repeat * 1000
@@ -0,0 +1,94 @@
+"""
+План запроса списка заметок автора до и после составного индекса.
+
+База наполняется примерно миллионом заметок, затем выводится план SQLite
+на схеме 0001_initial и после 0002_author_id_index.
+
+Запуск из каталога ya_note:
+    python -m benchmarks.index_plans --rows 1000000
+"""
+import argparse
+import random
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import setup_django, timeit
+
+BEFORE = '0001_initial'
+AFTER = '0002_author_id_index'
+USERS_COUNT = 1000
+REPEAT = 200
+
+QUERIES = {
+    'Первая страница заметок автора': (
+        'SELECT id, slug, title FROM notes_note WHERE author_id = %s '
+        'ORDER BY id ASC LIMIT 21',
+        (1,)
+    ),
+    'Следующая страница заметок автора': (
+        'SELECT id, slug, title FROM notes_note '
+        'WHERE author_id = %s AND id > %s ORDER BY id ASC LIMIT 21',
+        (1, 500_000)
+    ),
+}
+
+
+def seed(cursor, rows):
+    """Наполняет базу пользователями и заметками."""
+    now = datetime.now(timezone.utc)
+    cursor.executemany(
+        'INSERT INTO auth_user (password, last_login, is_superuser, '
+        'username, first_name, last_name, email, is_staff, is_active, '
+        "date_joined) VALUES ('', %s, 0, %s, '', '', '', 0, 1, %s)",
+        ((now, f'user{index}', now) for index in range(USERS_COUNT))
+    )
+    cursor.executemany(
+        'INSERT INTO notes_note (title, text, slug, author_id) '
+        'VALUES (%s, %s, %s, %s)',
+        (
+            ('Название заметки', 'Текст заметки', f'note-{index}',
+             random.randrange(1, USERS_COUNT + 1))
+            for index in range(rows)
+        )
+    )
+    cursor.execute('ANALYZE')
+
+
+def report(cursor, title):
+    """Выводит план и среднее время каждого запроса."""
+    print(f'\n=== {title} ===')
+    for name, (sql, params) in QUERIES.items():
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = '; '.join(row[-1] for row in cursor.fetchall())
+
+        def run():
+            cursor.execute(sql, params)
+            cursor.fetchall()
+
+        print(f'{name}: {timeit(run, REPEAT):.3f} мс\n    {plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.core.management import call_command
+        from django.db import connection, transaction
+
+        call_command('migrate', 'notes', BEFORE, verbosity=0)
+        with transaction.atomic(), connection.cursor() as cursor:
+            seed(cursor, args.rows)
+        with connection.cursor() as cursor:
+            report(cursor, BEFORE)
+        call_command('migrate', 'notes', AFTER, verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            report(cursor, AFTER)
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Объём данных и пиковая память списка заметок с длинными текстами.
+
+Сравнивается прежний запрос со всеми полями заметки и новый, который
+загружает только id, slug и title.
+
+Запуск из каталога ya_note:
+    python -m benchmarks.list_bodies
+"""
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks import setup_django
+
+BODY_SIZE = 100 * 1024
+NOTES_COUNT = 100
+
+
+def transferred_bytes(queryset):
+    """Сколько байт значений вернула база данных на запрос."""
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(
+            len(str(value).encode())
+            for row in cursor.fetchall() for value in row
+        )
+
+
+def peak_memory(func):
+    """Пиковое выделение памяти Python за время вызова, в байтах."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+        from django.core.management import call_command
+        from django.db import connection
+
+        from notes.models import Note
+
+        call_command('migrate', verbosity=0)
+        author = get_user_model().objects.create(username='author')
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='текст ' * (BODY_SIZE // 11),
+                slug=f'note-{index}',
+                author=author
+            )
+            for index in range(NOTES_COUNT)
+        )
+        notes = Note.objects.filter(author=author)
+        limit = settings.NOTES_PER_PAGE
+        cases = {
+            'все поля': notes[:limit],
+            "only('id', 'slug', 'title')": notes.only(
+                'id', 'slug', 'title'
+            )[:limit],
+        }
+        for name, queryset in cases.items():
+            size = transferred_bytes(queryset)
+            peak = peak_memory(lambda: list(queryset.all()))
+            print(
+                f'{name}: передано {size / 1024:.1f} КБ, '
+                f'пик памяти {peak / 1024:.1f} КБ'
+            )
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
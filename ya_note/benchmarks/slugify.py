@@ -0,0 +1,61 @@
+"""
+Транслитерация заголовков заметок с кэшем и без него.
+
+Корпус повторяет типичный импорт: немногие заголовки встречаются часто,
+остальные редко (распределение близко к закону Ципфа).
+
+Запуск из каталога ya_note:
+    python -m benchmarks.slugify
+"""
+import os
+import random
+from time import perf_counter
+
+TITLES = (
+    'Название заметки', 'Список покупок', 'Планы на неделю',
+    'Идеи для отпуска', 'Встреча с командой', 'Книги, которые стоит '
+    'прочитать', 'Рецепт борща', 'Заметки с лекции по истории',
+    'Дела на выходные', 'Подарки на день рождения', 'Расходы за месяц',
+    'Тренировка в зале', 'Черновик письма руководителю',
+    'Вопросы к собеседованию', 'Фильмы на вечер', 'Цитаты',
+)
+CORPUS_SIZE = 100_000
+UNIQUE_SHARE = 0.05
+
+
+def build_corpus():
+    random.seed(0)
+    weights = [1 / rank for rank in range(1, len(TITLES) + 1)]
+    corpus = random.choices(TITLES, weights, k=CORPUS_SIZE)
+    # Небольшая доля заголовков уникальна и в кэш не попадает.
+    for index in random.sample(
+        range(CORPUS_SIZE), int(CORPUS_SIZE * UNIQUE_SHARE)
+    ):
+        corpus[index] = f'{corpus[index]} №{index}'
+    return corpus
+
+
+def measure(func, corpus):
+    started = perf_counter()
+    for title in corpus:
+        func(title)
+    return perf_counter() - started
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
+    from pytils.translit import slugify
+
+    from notes.slugs import slugify_title
+
+    corpus = build_corpus()
+    plain = measure(slugify, corpus)
+    cached = measure(slugify_title, corpus)
+    print(f'Заголовков: {len(corpus)}, уникальных: {len(set(corpus))}')
+    print(f'pytils.slugify: {plain:.3f} с')
+    print(f'slugify_title:  {cached:.3f} с ({plain / cached:.1f}x)')
+    print(slugify_title.cache_info())
+
+
+if __name__ == '__main__':
+    main()
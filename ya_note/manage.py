@@ -2,10 +2,17 @@
 """Django's command-line utility for administrative tasks."""
 import os
 import sys
+from pathlib import Path
+
+# Общий для YaNews и YaNote пакет django_testing_common лежит в корне
+# репозитория; путь к нему ставится первым, раньше установленных пакетов.
+ROOT_DIR = str(Path(__file__).resolve().parent.parent)
 
 
 def main():
     """Run administrative tasks."""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
     try:
         from django.core.management import execute_from_command_line
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from notes.management.streams import (
+    FORMATS, RunStats, detect_format, open_stream, row_writer
+)
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = 'Выгружает заметки в файл JSON Lines или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл для выгрузки или - для стандартного вывода.'
+        )
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--author', help='Выгрузить заметки автора.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format_name = detect_format(path, options['format'])
+        notes = Note.objects.order_by('id')
+        if options['author']:
+            notes = notes.filter(author__username=options['author'])
+        stats = RunStats()
+        with open_stream(path, 'w') as stream:
+            write = row_writer(stream, format_name)
+            for row in notes.values_list(
+                'title', 'text', 'slug', 'author__username'
+            ).iterator(chunk_size=options['chunk_size']):
+                write(row)
+                stats.rows += 1
+        # Отчёт не должен смешиваться с данными в стандартном выводе.
+        report = self.stderr if path == '-' else self.stdout
+        report.write(stats.summary('Выгружено'))
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from notes.management.streams import (
+    FORMATS, RunStats, chunked, detect_format, open_stream, read_rows
+)
+from notes.models import Note
+from notes.search import get_index
+from notes.slugs import SlugAllocator
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Загружает заметки из файла JSON Lines или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл с заметками или - для стандартного ввода.'
+        )
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument(
+            '--author', help='Автор заметок, у которых не указан author.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format_name = detect_format(path, options['format'])
+        self.default_author = options['author']
+        self.author_ids = {}
+        self.allocator = SlugAllocator(
+            Note.objects, Note._meta.get_field('slug').max_length
+        )
+        stats = RunStats()
+        skipped = 0
+        with open_stream(path, 'r') as stream:
+            for rows in chunked(
+                read_rows(stream, format_name), options['chunk_size']
+            ):
+                notes = [self.build_note(row) for row in rows]
+                created = self.save_chunk(notes)
+                stats.rows += created
+                skipped += len(notes) - created
+        self.stdout.write(stats.summary('Загружено'))
+        if skipped:
+            self.stdout.write(f'Пропущено заметок с занятым slug: {skipped}')
+
+    def get_author_id(self, username):
+        """Авторы запрашиваются из базы один раз за загрузку."""
+        username = username or self.default_author
+        if not username:
+            raise CommandError('У заметки не указан автор, задайте --author.')
+        if username not in self.author_ids:
+            author_id = User.objects.filter(
+                username=username
+            ).values_list('id', flat=True).first()
+            if author_id is None:
+                raise CommandError(f'Пользователь {username} не найден.')
+            self.author_ids[username] = author_id
+        return self.author_ids[username]
+
+    def build_note(self, row):
+        note = Note(
+            text=row['text'],
+            slug=row.get('slug') or '',
+            author_id=self.get_author_id(row.get('author')),
+        )
+        if row.get('title'):
+            note.title = row['title']
+        return note
+
+    def save_chunk(self, notes):
+        """
+        Сохраняет пачку одним bulk_create и возвращает число новых заметок.
+
+        Если в пачке оказался занятый slug, она сохраняется построчно:
+        созданные из заголовков slug подбираются заново, а заметки
+        с занятым явно указанным slug пропускаются.
+        """
+        generated = [note for note in notes if not note.slug]
+        slugs = self.allocator.allocate([note.title for note in generated])
+        for note, slug in zip(generated, slugs):
+            note.slug = slug
+        try:
+            with transaction.atomic():
+                Note.objects.bulk_create(notes)
+                # bulk_create не отправляет сигналы, поэтому в индекс
+                # добавляются только записи этой пачки.
+                get_index().update_many(Note.objects.filter(
+                    slug__in=[note.slug for note in notes]
+                ))
+            return len(notes)
+        except IntegrityError:
+            self.allocator.reset()
+        for note in generated:
+            note.slug = ''
+        created = 0
+        for note in notes:
+            try:
+                with transaction.atomic():
+                    note.save()
+                created += 1
+            except IntegrityError:
+                pass
+        return created
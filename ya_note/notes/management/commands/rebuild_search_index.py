@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from django_testing_common.search import MemoryIndex
+from notes.search import get_index
+
+
+class Command(BaseCommand):
+    help = 'Полностью перестраивает поисковый индекс заметок.'
+
+    def handle(self, *args, **options):
+        index = get_index()
+        if isinstance(index, MemoryIndex):
+            self.stdout.write(
+                'FTS5 недоступен: индекс в памяти строится каждым '
+                'процессом при первом поиске.'
+            )
+            return
+        index.rebuild()
+        self.stdout.write('Поисковый индекс заметок перестроен.')
@@ -0,0 +1,103 @@
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import CommandError
+
+try:
+    import resource
+except ImportError:
+    # Модуля resource нет в Windows, там пиковая память не выводится.
+    resource = None
+
+FIELDS = ('title', 'text', 'slug', 'author')
+FORMATS = ('jsonl', 'csv')
+
+
+def detect_format(path, format_name):
+    """Формат задан явно или определяется по расширению файла."""
+    if format_name:
+        return format_name
+    suffix = Path(path).suffix.lstrip('.')
+    if suffix in FORMATS:
+        return suffix
+    raise CommandError(
+        f'Не удалось определить формат файла {path}, укажите --format.'
+    )
+
+
+@contextmanager
+def open_stream(path, mode):
+    """Открывает файл или стандартный поток, если путь равен -."""
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+        return
+    with open(path, mode, encoding='utf-8', newline='') as stream:
+        yield stream
+
+
+def read_rows(stream, format_name):
+    """Построчно читает заметки, не загружая файл в память целиком."""
+    if format_name == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def row_writer(stream, format_name):
+    """Функция записи одной заметки в выбранном формате."""
+    if format_name == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        return writer.writerow
+
+    def write_json_line(row):
+        stream.write(json.dumps(
+            dict(zip(FIELDS, row)), ensure_ascii=False
+        ) + '\n')
+
+    return write_json_line
+
+
+def chunked(iterable, size):
+    """Разбивает поток на списки не длиннее size."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def peak_rss():
+    """Пиковый RSS процесса в мегабайтах или None, если он недоступен."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss измеряется в килобайтах, а в macOS — в байтах.
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return peak / 1024
+
+
+class RunStats:
+    """Скорость обработки и пиковое потребление памяти процессом."""
+
+    def __init__(self):
+        self.rows = 0
+        self.started = perf_counter()
+
+    def summary(self, action):
+        elapsed = perf_counter() - self.started
+        speed = self.rows / elapsed if elapsed else 0
+        line = (
+            f'{action}: {self.rows} заметок за {elapsed:.2f} с '
+            f'({speed:.0f} строк/с)'
+        )
+        peak = peak_rss()
+        if peak is None:
+            return line
+        return f'{line}, пиковый RSS {peak:.1f} МБ'
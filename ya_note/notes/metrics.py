@@ -0,0 +1,12 @@
+"""Источник обращений к кэшу для django_testing_common.metrics."""
+from .slugs import slugify_title
+
+
+def cache_samples():
+    """Обращения к кэшу транслитерации заголовков в slug."""
+    info = slugify_title.cache_info()
+    labels = (('cache', 'slugs'),)
+    return {
+        ('cache_hits_total', labels): info.hits,
+        ('cache_misses_total', labels): info.misses,
+    }
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_author_id_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='note',
+            options={'ordering': ('id',)},
+        ),
+    ]
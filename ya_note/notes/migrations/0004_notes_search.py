@@ -0,0 +1,37 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:40
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_search_table(apps, schema_editor):
+    """Таблица FTS5 создаётся, только если SQLite собран с этим модулем."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE notes_search '
+            'USING fts5(title, text, author_id UNINDEXED)'
+        )
+    except OperationalError:
+        return
+    schema_editor.execute(
+        'INSERT INTO notes_search (rowid, title, text, author_id) '
+        'SELECT id, title, text, author_id FROM notes_note'
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS notes_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 3.2.15 on 2026-10-18 21:05
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+TRIGGERS = (
+    'CREATE TRIGGER notes_search_insert AFTER INSERT ON notes_note BEGIN '
+    'INSERT INTO notes_search (rowid, title, text) '
+    'VALUES (new.id, new.title, new.text); END',
+    'CREATE TRIGGER notes_search_delete AFTER DELETE ON notes_note BEGIN '
+    "INSERT INTO notes_search (notes_search, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    'CREATE TRIGGER notes_search_update AFTER UPDATE OF title, text '
+    'ON notes_note BEGIN '
+    "INSERT INTO notes_search (notes_search, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    'INSERT INTO notes_search (rowid, title, text) '
+    'VALUES (new.id, new.title, new.text); END',
+)
+
+
+def drop_search_table(schema_editor):
+    for name in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS notes_search_{name}')
+    schema_editor.execute('DROP TABLE IF EXISTS notes_search')
+
+
+def create_external_content_table(apps, schema_editor):
+    """
+    Индекс без копии текста и без столбца author_id.
+
+    Таблица читает заголовок и текст из notes_note, автор проверяется
+    соединением по rowid, а триггеры обновляют индекс при любой записи,
+    включая bulk_create.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_search_table(schema_editor)
+    try:
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE notes_search USING fts5('
+            "title, text, content='notes_note', content_rowid='id')"
+        )
+    except OperationalError:
+        return
+    for trigger in TRIGGERS:
+        schema_editor.execute(trigger)
+    schema_editor.execute(
+        "INSERT INTO notes_search (notes_search) VALUES ('rebuild')"
+    )
+
+
+def restore_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_search_table(schema_editor)
+    try:
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE notes_search '
+            'USING fts5(title, text, author_id UNINDEXED)'
+        )
+    except OperationalError:
+        return
+    schema_editor.execute(
+        'INSERT INTO notes_search (rowid, title, text, author_id) '
+        'SELECT id, title, text, author_id FROM notes_note'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0004_notes_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_external_content_table, restore_search_table
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
-from pytils.translit import slugify
+from .slugs import last_slug_number, slug_stem, slugify_title
+
+SLUG_ATTEMPTS = 3
 
 
 class Note(models.Model):
@@ -26,13 +28,49 @@ class Note(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
 
+    class Meta:
+        ordering = ('id',)
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Пустой slug создаётся из заголовка.
+
+        Свободен ли slug, проверяет уникальный индекс при записи. Запись
+        идёт в своей точке сохранения, поэтому конфликт не ломает внешнюю
+        транзакцию. Если конфликт именно по slug, созданному из
+        заголовка, запись повторяется со следующим свободным номером.
+        """
+        if self.slug:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        base = slugify_title(self.title)[:max_slug_length]
+        self.slug = base
+        for _ in range(SLUG_ATTEMPTS - 1):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if not self.slug_taken():
+                    raise
+                self.slug = self._next_free_slug(base)
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
+    def slug_taken(self):
+        """Занят ли slug другой заметкой."""
+        return Note.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+
+    def _next_free_slug(self, base):
+        """Следующий свободный slug вида base-N."""
+        stem = slug_stem(base, self._meta.get_field('slug').max_length)
+        return f'{stem}-{last_slug_number(Note.objects, stem) + 1}'
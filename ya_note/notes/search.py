@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+from django.conf import settings
+
+from django_testing_common.search import make_index
+
+from .models import Note
+
+TABLE = 'notes_search'
+
+
+@lru_cache(maxsize=None)
+def get_index():
+    """Бэкенд поиска задаётся настройкой NOTES_SEARCH_BACKEND."""
+    return make_index(
+        Note, TABLE, settings.NOTES_SEARCH_BACKEND, filters=('author_id',)
+    )
+
+
+def search_page(query, author_id, page, per_page):
+    """
+    Id заметок автора на странице результатов и признак следующей.
+
+    Поиск, как и NoteBase.get_queryset, ограничен заметками автора.
+    """
+    return get_index().page(query, page, per_page, author_id=author_id)
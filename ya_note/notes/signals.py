@@ -0,0 +1,22 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django_testing_common.sqlite import apply_sqlite_pragmas
+from .models import Note
+from .search import get_index
+
+
+@receiver(post_save, sender=Note)
+def index_note(sender, instance, update_fields=None, **kwargs):
+    """Обновляем поисковый индекс, если изменился заголовок или текст."""
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        get_index().update(instance)
+
+
+@receiver(post_delete, sender=Note)
+def unindex_note(sender, instance, **kwargs):
+    get_index().remove(instance.pk)
+
+
+connection_created.connect(apply_sqlite_pragmas)
@@ -0,0 +1,88 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models.functions import Length
+from pytils.translit import slugify
+
+# Запас длины slug под суффикс вида -123456.
+SLUG_SUFFIX_RESERVE = 7
+# Сколько базовых slug помнит SlugAllocator между пачками.
+MAX_TRACKED_SLUGS = 10_000
+
+
+@lru_cache(maxsize=settings.SLUG_CACHE_SIZE)
+def slugify_title(title):
+    """
+    Транслитерация заголовка в slug с запоминанием результата.
+
+    Заголовки часто повторяются, особенно при массовом импорте, а
+    транслитерация заметно дороже поиска в кэше. Статистика доступна
+    через slugify_title.cache_info().
+    """
+    return slugify(title)
+
+
+def slug_stem(base, max_length):
+    """Основа slug, к которой поместится числовой суффикс."""
+    return base[:max_length - SLUG_SUFFIX_RESERVE]
+
+
+def last_slug_number(queryset, stem):
+    """
+    Наибольший номер N среди slug вида stem-N или 1, если таких нет.
+
+    Из базы берётся только slug с наибольшим номером, поэтому число
+    запросов не зависит от количества заметок с таким же заголовком.
+    """
+    last_slug = queryset.filter(
+        slug__gt=f'{stem}-',
+        slug__lt=f'{stem}.',
+        slug__regex=rf'^{re.escape(stem)}-[0-9]+$',
+    ).order_by(
+        Length('slug').desc(), '-slug'
+    ).values_list('slug', flat=True).first()
+    return int(last_slug.rsplit('-', 1)[1]) if last_slug else 1
+
+
+class SlugAllocator:
+    """
+    Раздаёт свободные slug заметкам, которые создаются пачками.
+
+    Для каждого базового slug запоминается следующий свободный номер,
+    поэтому повторяющиеся заголовки обходятся одним запросом за весь
+    импорт, а уникальные — одним запросом на пачку.
+    """
+
+    def __init__(self, queryset, max_length):
+        self.queryset = queryset
+        self.max_length = max_length
+        self._next_numbers = {}
+
+    def reset(self):
+        """Забыть номера, например после конфликта при записи."""
+        self._next_numbers.clear()
+
+    def allocate(self, titles):
+        """Свободные slug для заголовков одной пачки новых заметок."""
+        if len(self._next_numbers) > MAX_TRACKED_SLUGS:
+            self.reset()
+        bases = [slugify_title(title)[:self.max_length] for title in titles]
+        unknown = set(bases) - self._next_numbers.keys()
+        if unknown:
+            taken = set(self.queryset.filter(
+                slug__in=unknown
+            ).values_list('slug', flat=True))
+            for base in unknown:
+                self._next_numbers[base] = 1 + (last_slug_number(
+                    self.queryset, slug_stem(base, self.max_length)
+                ) if base in taken else 0)
+        slugs = []
+        for base in bases:
+            number = self._next_numbers[base]
+            self._next_numbers[base] = number + 1
+            slugs.append(
+                base if number == 1
+                else f'{slug_stem(base, self.max_length)}-{number}'
+            )
+        return slugs
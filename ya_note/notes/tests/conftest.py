@@ -0,0 +1,3 @@
+from django_testing_common.db_snapshot import (  # noqa: F401
+    django_db_keepdb, django_db_modify_db_settings, django_db_setup
+)
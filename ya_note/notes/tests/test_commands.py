@@ -0,0 +1,103 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from pytils.translit import slugify
+
+from notes.models import Note
+from notes.tests.fixtures import TestNoteBase
+
+
+class TestImportExport(TestNoteBase):
+    """Тесты массовой выгрузки и загрузки заметок."""
+
+    SAME_TITLE_NOTES = 20
+    CHUNK_SIZE = 8
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+
+    def call(self, command, *args, **options):
+        """Вызов команды с подавлением отчёта."""
+        call_command(command, *args, stdout=StringIO(), **options)
+
+    def test_export_jsonl(self):
+        """Проверка выгрузки заметок в JSON Lines."""
+        path = self.temp_dir / 'notes.jsonl'
+        self.call('export_notes', path, chunk_size=self.CHUNK_SIZE)
+        rows = [json.loads(line) for line in path.open(encoding='utf-8')]
+        self.assertEqual(rows, [{
+            'title': self.note.title,
+            'text': self.note.text,
+            'slug': self.note.slug,
+            'author': self.author.username,
+        }])
+
+    def test_import_generates_slugs_in_batches(self):
+        """Проверка загрузки повторяющихся заголовков пачками."""
+        path = self.temp_dir / 'notes.jsonl'
+        with path.open('w', encoding='utf-8') as file:
+            for index in range(self.SAME_TITLE_NOTES):
+                file.write(json.dumps(
+                    {'title': self.NOTE_TITLE, 'text': f'Текст {index}'}
+                ) + '\n')
+        notes_count = Note.objects.count()
+        self.call(
+            'import_notes', path,
+            author=self.another.username, chunk_size=self.CHUNK_SIZE
+        )
+        self.assertEqual(
+            Note.objects.count(), notes_count + self.SAME_TITLE_NOTES
+        )
+        base_slug = slugify(self.NOTE_TITLE)
+        self.assertEqual(
+            set(Note.objects.filter(
+                author=self.another
+            ).values_list('slug', flat=True)),
+            {
+                f'{base_slug}-{number}'
+                for number in range(2, self.SAME_TITLE_NOTES + 2)
+            }
+        )
+
+    def test_import_skips_taken_slug(self):
+        """Проверка загрузки пачки с уже занятым slug."""
+        path = self.temp_dir / 'notes.csv'
+        with path.open('w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(('title', 'text', 'slug'))
+            writer.writerow((self.NOTE_TITLE, 'Дубликат', self.note.slug))
+            writer.writerow((self.NOTE_TITLE, 'Новая', ''))
+        notes_count = Note.objects.count()
+        self.call('import_notes', path, author=self.author.username)
+        self.assertEqual(Note.objects.count(), notes_count + 1)
+        self.assertTrue(Note.objects.filter(text='Новая').exists())
+
+    def test_report_without_resource_module(self):
+        """Проверка отчёта без пиковой памяти там, где нет resource."""
+        path = self.temp_dir / 'notes.jsonl'
+        self.call('export_notes', path)
+        stdout = StringIO()
+        with patch('notes.management.streams.resource', None):
+            call_command('import_notes', path, stdout=stdout)
+        report = stdout.getvalue()
+        self.assertIn('Загружено', report)
+        self.assertNotIn('RSS', report)
+
+    def test_csv_round_trip(self):
+        """Проверка выгрузки и повторной загрузки в CSV."""
+        path = self.temp_dir / 'notes.csv'
+        self.call('export_notes', path)
+        Note.objects.all().delete()
+        self.call('import_notes', path)
+        note = Note.objects.get()
+        self.assertEqual(
+            (note.title, note.text, note.slug, note.author),
+            (self.note.title, self.note.text, self.note.slug, self.author)
+        )
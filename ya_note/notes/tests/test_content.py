@@ -1,6 +1,10 @@
+from http import HTTPStatus
+
 from django.contrib.auth import get_user
+from django.test import override_settings
 
 from notes.forms import NoteForm
+from notes.models import Note
 from notes.tests.fixtures import TestNoteBase
 
 
@@ -29,3 +33,57 @@ class TestFormNote(TestNoteBase):
                 response = self.author_client.get(url)
                 self.assertIn('form', response.context)
                 self.assertIsInstance(response.context['form'], NoteForm)
+
+
+@override_settings(NOTES_PER_PAGE=2)
+class TestNotesListPages(TestNoteBase):
+    """Тесты постраничного списка заметок."""
+
+    NOTES_NUMBER = 5
+    # Сессия, пользователь и одна страница заметок.
+    PAGE_QUERIES = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание транзакций для временой базы данных."""
+        super().setUpTestData()
+        Note.objects.bulk_create(
+            Note(
+                title=f'{cls.NOTE_TITLE} {index}',
+                text=cls.NOTE_TEXT,
+                slug=f'note-{index}',
+                author=cls.author
+            )
+            for index in range(cls.NOTES_NUMBER - 1)
+        )
+
+    def test_pages_follow_cursor(self):
+        """Проверка обхода всех заметок автора по курсору."""
+        seen_ids = []
+        params = {}
+        while True:
+            with self.assertNumQueries(self.PAGE_QUERIES):
+                response = self.author_client.get(self.LIST_URL, params)
+            seen_ids += [note.id for note in response.context['object_list']]
+            if response.context['next_cursor'] is None:
+                break
+            params = {'after': response.context['next_cursor']}
+        self.assertEqual(seen_ids, sorted(set(seen_ids)))
+        self.assertEqual(len(seen_ids), self.NOTES_NUMBER)
+
+    def test_list_does_not_load_text(self):
+        """Проверка, что текст заметок не загружается в список."""
+        response = self.author_client.get(self.LIST_URL)
+        for note in response.context['object_list']:
+            self.assertIn('text', note.get_deferred_fields())
+
+    def test_invalid_cursor(self):
+        """Проверка ответа на некорректный курсор."""
+        for after in ('abc', '²', '1.5'):
+            with self.subTest(after=after):
+                response = self.author_client.get(
+                    self.LIST_URL, {'after': after}
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
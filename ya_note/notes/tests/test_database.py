@@ -0,0 +1,52 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from django.db import connections
+from django.test import TestCase, override_settings
+
+from django_testing_common.db_snapshot import snapshot_key
+
+
+class TestSqlitePragmas(TestCase):
+    """Тесты настройки соединений с SQLite."""
+
+    PRAGMAS = {'cache_size': -1234, 'busy_timeout': 4321}
+
+    def test_new_connection_gets_pragmas(self):
+        """Проверка настройки нового соединения по SQLITE_PRAGMAS."""
+        with override_settings(SQLITE_PRAGMAS=self.PRAGMAS):
+            connection = connections.create_connection('default')
+            self.addCleanup(connection.close)
+            with connection.cursor() as cursor:
+                for name, value in self.PRAGMAS.items():
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(cursor.fetchone()[0], value)
+
+
+class TestMigratedSnapshot(TestCase):
+    """Тесты снимка тестовой базы после миграций."""
+
+    def test_key_follows_migrations(self):
+        """Проверка смены снимка при изменении файла миграции."""
+        connection = connections['default']
+        key = snapshot_key(connection)
+        self.assertEqual(snapshot_key(connection), key)
+        read_bytes = Path.read_bytes
+
+        def edited(path):
+            content = read_bytes(path)
+            if path.name == '0001_initial.py':
+                content += b'\n# edited\n'
+            return content
+
+        with patch.object(Path, 'read_bytes', edited):
+            self.assertNotEqual(snapshot_key(connection), key)
+
+    def test_restored_schema(self):
+        """Проверка, что в тестовой базе есть таблицы всех миграций."""
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM django_migrations WHERE app = %s',
+                ('notes',)
+            )
+            self.assertGreater(cursor.fetchone()[0], 0)
@@ -1,9 +1,11 @@
 from http import HTTPStatus
 
+from django.db import IntegrityError
 from pytils.translit import slugify
 
 from notes.forms import WARNING
 from notes.models import Note
+from notes.slugs import slugify_title
 from notes.tests.fixtures import TestNoteBase
 
 
@@ -64,6 +66,15 @@ class TestNoteEditDeleteSlug(TestNoteBase):
 
     NEW_NOTE_TITLE = 'Обновлённый заголовок'
     NEW_NOTE_TEXT = 'Обновлённый текст записи'
+    SAME_TITLE_NOTES = 50
+    # Сессия, пользователь и один INSERT внутри точки сохранения;
+    # поисковый индекс обновляют триггеры базы.
+    CREATE_QUERIES = 5
+    # Неудачный INSERT, проверка занятости slug, поиск последнего
+    # номера, повторный INSERT и точки сохранения вокруг обеих попыток.
+    CONFLICT_QUERIES = 9
+    # Неудачный INSERT в точке сохранения и проверка занятости slug.
+    FAILED_INSERT_QUERIES = 5
 
     @classmethod
     def setUpTestData(cls):
@@ -84,6 +95,62 @@ class TestNoteEditDeleteSlug(TestNoteBase):
         expected_slug = slugify(self.form_data['title'])
         self.assertEqual(new_note.slug, expected_slug)
 
+    def test_same_title_gets_numbered_slug(self):
+        """Проверка нумерации slug заметок с одинаковым заголовком."""
+        for _ in range(3):
+            response = self.author_client.post(
+                self.ADD_URL, data=self.form_data
+            )
+            self.assertRedirects(response, self.SUCCESS_URL)
+        expected_slug = slugify(self.form_data['title'])
+        self.assertEqual(
+            list(Note.objects.filter(
+                title=self.form_data['title']
+            ).order_by('id').values_list('slug', flat=True)),
+            [expected_slug, f'{expected_slug}-2', f'{expected_slug}-3']
+        )
+
+    def test_create_does_not_check_slug_beforehand(self):
+        """Проверка создания заметки без отдельного запроса о slug."""
+        with self.assertNumQueries(self.CREATE_QUERIES):
+            self.author_client.post(self.ADD_URL, data=self.form_data)
+
+    def test_slug_allocation_does_not_probe(self):
+        """Проверка числа запросов при множестве одинаковых заголовков."""
+        base_slug = slugify(self.NOTE_TITLE)
+        Note.objects.bulk_create(
+            Note(
+                title=self.NOTE_TITLE,
+                text=self.NOTE_TEXT,
+                author=self.author,
+                slug=f'{base_slug}-{number}'
+            )
+            for number in range(2, self.SAME_TITLE_NOTES + 1)
+        )
+        note = Note(
+            title=self.NOTE_TITLE, text=self.NOTE_TEXT, author=self.author
+        )
+        with self.assertNumQueries(self.CONFLICT_QUERIES):
+            note.save()
+        self.assertEqual(
+            note.slug, f'{base_slug}-{self.SAME_TITLE_NOTES + 1}'
+        )
+
+    def test_other_integrity_errors_are_not_retried(self):
+        """Проверка того, что повтор бывает только при конфликте slug."""
+        note = Note(title=self.NEW_NOTE_TITLE, text=None, author=self.author)
+        with self.assertNumQueries(self.FAILED_INSERT_QUERIES):
+            with self.assertRaises(IntegrityError):
+                note.save()
+
+    def test_slug_transliteration_is_cached(self):
+        """Проверка повторного использования транслитерации заголовка."""
+        slugify_title.cache_clear()
+        for _ in range(2):
+            self.author_client.post(self.ADD_URL, data=self.form_data)
+        cache_info = slugify_title.cache_info()
+        self.assertEqual((cache_info.misses, cache_info.hits), (1, 1))
+
     def test_author_can_edit_note(self):
         """Проверка редактирования заметки авторизованным пользователем."""
         response = self.author_client.post(self.edit_url, data=self.form_data)
@@ -0,0 +1,100 @@
+import json
+import tempfile
+import threading
+from http import HTTPStatus
+
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from django_testing_common.metrics import Registry, collect, registry
+from notes.tests.fixtures import TestNoteBase, User
+
+SCRAPER_IP = '10.0.0.9'
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_ALLOWED_IPS=[SCRAPER_IP])
+class TestMetrics(TestNoteBase):
+    """Тесты метрик /metrics."""
+
+    METRICS_URL = reverse('metrics')
+    THREADS = 8
+    INCREMENTS = 1000
+
+    def setUp(self):
+        registry.reset()
+
+    def test_request_metrics(self):
+        """Проверка счётчика и гистограмм запросов по маршруту."""
+        client = Client(REMOTE_ADDR=SCRAPER_IP)
+        client.force_login(self.author)
+        client.get(self.LIST_URL)
+        lines = client.get(self.METRICS_URL).content.decode().splitlines()
+        for line in (
+            'http_requests_total{route="notes:list",method="GET",'
+            'status="200"} 1',
+            'http_request_duration_seconds_count{route="notes:list"} 1',
+            'http_request_queries_bucket{route="notes:list",le="+Inf"} 1',
+        ):
+            with self.subTest(line=line):
+                self.assertIn(line, lines)
+        self.assertTrue(
+            any(line.startswith('cache_hit_ratio{cache="slugs"}')
+                for line in lines)
+        )
+
+    def test_access(self):
+        """Проверка доступа к метрикам сотрудников и разрешённых адресов."""
+        staff_client = Client()
+        staff_client.force_login(
+            User.objects.create(username='Сотрудник', is_staff=True)
+        )
+        for name, client, status in (
+            ('anonymous', Client(), HTTPStatus.FORBIDDEN),
+            ('author', self.author_client, HTTPStatus.FORBIDDEN),
+            ('staff', staff_client, HTTPStatus.OK),
+            ('scraper', Client(REMOTE_ADDR=SCRAPER_IP), HTTPStatus.OK),
+        ):
+            with self.subTest(client=name):
+                self.assertEqual(
+                    client.get(self.METRICS_URL).status_code, status
+                )
+
+    def test_off_by_default(self):
+        """Проверка, что без METRICS_ENABLED страницы метрик нет."""
+        with override_settings(METRICS_ENABLED=False):
+            response = Client(REMOTE_ADDR=SCRAPER_IP).get(self.METRICS_URL)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_thread_shards_are_summed(self):
+        """Проверка суммы счётчиков, записанных из разных потоков."""
+        local_registry = Registry()
+        labels = (('route', 'notes:list'),)
+
+        def work():
+            for _ in range(self.INCREMENTS):
+                local_registry.inc('http_requests_total', labels)
+
+        threads = [
+            threading.Thread(target=work) for _ in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            local_registry.samples()[('http_requests_total', labels)],
+            self.THREADS * self.INCREMENTS
+        )
+
+    def test_file_store_sums_processes(self):
+        """Проверка сложения метрик других процессов из METRICS_DIR."""
+        labels = [['route', 'notes:home'], ['method', 'GET'], ['status', 200]]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(f'{tmp_dir}/0.json', 'w') as file:
+                json.dump([['http_requests_total', labels, 2]], file)
+            with override_settings(METRICS_DIR=tmp_dir):
+                Client().get(self.HOME_URL)
+                samples = collect()
+        self.assertEqual(
+            samples[('http_requests_total', tuple(map(tuple, labels)))], 3
+        )
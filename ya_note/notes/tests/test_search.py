@@ -0,0 +1,142 @@
+import json
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from notes.search import get_index
+from notes.tests.fixtures import TestNoteBase
+
+
+class TestNoteSearch(TestNoteBase):
+    """Тесты полнотекстового поиска по заметкам."""
+
+    SEARCH_URL = reverse('notes:search')
+    BACKENDS = ('fts5', 'memory')
+
+    def setUp(self):
+        get_index.cache_clear()
+        self.addCleanup(get_index.cache_clear)
+
+    def found_titles(self, client, query, page=1):
+        response = client.get(self.SEARCH_URL, {'q': query, 'page': page})
+        return [note.title for note in response.context['object_list']]
+
+    def on_backends(self):
+        """Поочерёдно включает оба бэкенда поиска."""
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend), override_settings(
+                NOTES_SEARCH_BACKEND=backend
+            ):
+                get_index.cache_clear()
+                yield backend
+
+    def test_search_is_limited_to_author(self):
+        """Проверка, что чужие заметки не попадают в результаты."""
+        for _ in self.on_backends():
+            self.assertEqual(
+                self.found_titles(self.author_client, 'записи'),
+                [self.NOTE_TITLE]
+            )
+            self.assertEqual(
+                self.found_titles(self.another_client, 'записи'), []
+            )
+
+    def test_title_match_ranks_higher(self):
+        """Проверка, что совпадение в заголовке важнее совпадения в тексте."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(
+                title='Покупки', text='Молоко, хлеб', author=self.author
+            )
+            Note.objects.create(
+                title='Молоко', text='Купить', author=self.author
+            )
+        for _ in self.on_backends():
+            self.assertEqual(
+                self.found_titles(self.author_client, 'МОЛОКО'),
+                ['Молоко', 'Покупки']
+            )
+
+    def test_index_follows_changes(self):
+        """Проверка обновления индекса при изменении и удалении заметки."""
+        for _ in self.on_backends():
+            with self.captureOnCommitCallbacks(execute=True):
+                note = Note.objects.create(
+                    title='Старый', text='текст', author=self.author
+                )
+            self.assertEqual(
+                self.found_titles(self.author_client, 'старый'), ['Старый']
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                note.title = 'Новый'
+                note.save()
+            self.assertEqual(
+                self.found_titles(self.author_client, 'старый'), []
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                note.delete()
+            self.assertEqual(
+                self.found_titles(self.author_client, 'новый'), []
+            )
+
+    def test_imported_notes_are_indexed(self):
+        """Проверка поиска по заметкам, загруженным import_notes."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / 'notes.jsonl'
+        for backend in self.on_backends():
+            self.assertEqual(
+                self.found_titles(self.author_client, backend), []
+            )
+            path.write_text(json.dumps({
+                'title': backend.upper(), 'text': 'загружено',
+                'author': self.author.username,
+            }) + '\n', encoding='utf-8')
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('import_notes', path, stdout=StringIO())
+            self.assertEqual(
+                self.found_titles(self.author_client, backend),
+                [backend.upper()]
+            )
+
+    def test_results_are_paginated(self):
+        """Проверка постраничного вывода результатов."""
+        extra = 2
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='общий текст',
+                slug=f'search-{index}',
+                author=self.author
+            )
+            for index in range(settings.SEARCH_RESULTS_PER_PAGE + extra)
+        )
+        for _ in self.on_backends():
+            call_command('rebuild_search_index', stdout=StringIO())
+            response = self.author_client.get(
+                self.SEARCH_URL, {'q': 'общий'}
+            )
+            self.assertEqual(
+                len(response.context['object_list']),
+                settings.SEARCH_RESULTS_PER_PAGE
+            )
+            self.assertTrue(response.context['has_next'])
+            self.assertEqual(
+                len(self.found_titles(self.author_client, 'общий', page=2)),
+                extra
+            )
+
+    def test_invalid_page(self):
+        """Проверка ответа на некорректный номер страницы."""
+        for page in ('0', 'abc', '²'):
+            with self.subTest(page=page):
+                response = self.author_client.get(
+                    self.SEARCH_URL, {'q': 'текст', 'page': page}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
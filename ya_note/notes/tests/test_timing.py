@@ -0,0 +1,34 @@
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from notes.tests.fixtures import TestNoteBase
+
+
+class TestRequestTiming(TestNoteBase):
+    """Тесты замеров запросов в заголовке Server-Timing."""
+
+    def test_timing_disabled_by_default(self):
+        """Проверка, что без настройки замеров нет."""
+        response = self.author_client.get(self.LIST_URL)
+        self.assertNotIn('Server-Timing', response)
+        self.assertFalse(hasattr(response, 'timings'))
+
+    @override_settings(REQUEST_TIMING=True)
+    def test_note_views_are_timed(self):
+        """Проверка замеров на страницах заметок автора."""
+        client = Client()
+        client.force_login(self.author)
+        for url in (self.LIST_URL, self.ADD_URL, self.detail_url):
+            with self.subTest(url=url):
+                with self.assertLogs(
+                    'django_testing_common.timing', 'INFO'
+                ) as logs:
+                    with CaptureQueriesContext(connection) as queries:
+                        response = client.get(url)
+                self.assertEqual(response.timings.queries, len(queries))
+                self.assertGreater(response.timings.render, 0)
+                self.assertTrue(
+                    response['Server-Timing'].startswith('db;dur=')
+                )
+                self.assertIn(f'path={url} status=200', logs.output[0])
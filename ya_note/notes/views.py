@@ -1,9 +1,16 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
+from django.db import IntegrityError
 from django.urls import reverse_lazy
 from django.views import generic
 
-from .forms import NoteForm
+from .forms import WARNING, NoteForm
 from .models import Note
+from .search import search_page
+
+INVALID_CURSOR = 'Некорректный курсор страницы заметок.'
+INVALID_PAGE = 'Некорректный номер страницы.'
 
 
 class Home(generic.TemplateView):
@@ -26,22 +33,37 @@ class NoteBase(LoginRequiredMixin):
         return self.model.objects.filter(author=self.request.user)
 
 
-class NoteCreate(NoteBase, generic.CreateView):
-    """Добавление заметки."""
+class NoteFormBase(NoteBase):
+    """Базовый класс для добавления и редактирования заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
 
     def form_valid(self, form):
-        new_note = form.save(commit=False)
-        new_note.author = self.request.user
-        new_note.save()
+        """
+        Занятый slug обнаруживается уникальным индексом при записи.
+
+        Note.save пишет в своей точке сохранения, поэтому после ошибки
+        соединение остаётся рабочим.
+        """
+        try:
+            return super().form_valid(form)
+        except IntegrityError:
+            if not form.instance.slug_taken():
+                raise
+            form.add_error('slug', form.instance.slug + WARNING)
+            return self.form_invalid(form)
+
+
+class NoteCreate(NoteFormBase, generic.CreateView):
+    """Добавление заметки."""
+
+    def form_valid(self, form):
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class NoteUpdate(NoteBase, generic.UpdateView):
+class NoteUpdate(NoteFormBase, generic.UpdateView):
     """Редактирование заметки."""
-    template_name = 'notes/form.html'
-    form_class = NoteForm
 
 
 class NoteDelete(NoteBase, generic.DeleteView):
@@ -53,6 +75,64 @@ class NotesList(NoteBase, generic.ListView):
     """Список всех заметок пользователя."""
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """
+        Страница заметок, следующая за курсором.
+
+        Курсор — id последней показанной заметки, поэтому порядок
+        стабилен, а любая страница стоит как первая. Загружаются только
+        поля, которые выводит шаблон, без текста заметки.
+        """
+        notes = super().get_queryset().only('id', 'slug', 'title')
+        after = self.request.GET.get('after')
+        if after:
+            try:
+                after = int(after)
+            except ValueError:
+                raise BadRequest(INVALID_CURSOR)
+            notes = notes.filter(id__gt=after)
+        page = list(notes[:settings.NOTES_PER_PAGE + 1])
+        self.next_cursor = None
+        if len(page) > settings.NOTES_PER_PAGE:
+            page = page[:settings.NOTES_PER_PAGE]
+            self.next_cursor = page[-1].id
+        return page
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        return context
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """Полнотекстовый поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        """Заметки страницы результатов в порядке релевантности."""
+        self.query = self.request.GET.get('q', '').strip()
+        try:
+            self.page = int(self.request.GET.get('page', '1'))
+        except ValueError:
+            raise BadRequest(INVALID_PAGE)
+        if self.page < 1:
+            raise BadRequest(INVALID_PAGE)
+        ids, self.has_next = search_page(
+            self.query, self.request.user.id, self.page,
+            settings.SEARCH_RESULTS_PER_PAGE
+        )
+        found = super().get_queryset().only(
+            'id', 'slug', 'title'
+        ).in_bulk(ids)
+        return [found[pk] for pk in ids if pk in found]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(
+            query=self.query, page=self.page, has_next=self.has_next
+        )
+        return context
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
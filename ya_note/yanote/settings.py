@@ -1,7 +1,13 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
 
+from django_testing_common.settings import (  # noqa: F401
+    LOGGING, METRICS_ALLOWED_IPS, METRICS_DIR, METRICS_ENABLED,
+    METRICS_FLUSH_INTERVAL, REQUEST_TIMING
+)
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-yipnj$#j!ajarq%k55z4kuf3x79)91h0h42o9!1ho(z=!%mt=#'
@@ -22,6 +28,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_testing_common.timing.RequestTimingMiddleware',
+    'django_testing_common.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +67,24 @@ DATABASES = {
     }
 }
 
+# Профиль базы данных выбирается переменной окружения DATABASE_PROFILE.
+# В профиле production соединения живут между запросами, а SQLite
+# работает в режиме WAL, где читатели не ждут пишущую транзакцию.
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'development')
+
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite.
+SQLITE_PRAGMAS = {}
+
+if DATABASE_PROFILE == 'production':
+    DATABASES['default']['CONN_MAX_AGE'] = 600
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+    }
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +113,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+SLUG_CACHE_SIZE = 4096
+
+NOTES_PER_PAGE = 50
+
+NOTES_SEARCH_BACKEND = 'auto'
+
+SEARCH_RESULTS_PER_PAGE = 10
+
+# Источник обращений к кэшу для /metrics.
+METRICS_CACHE_STATS = 'notes.metrics.cache_samples'
@@ -4,9 +4,12 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path
 from django.views.generic import CreateView
 
+from django_testing_common.metrics import Metrics
+
 urlpatterns = [
     path('', include('notes.urls')),
     path('admin/', admin.site.urls),
+    path('metrics', Metrics.as_view(), name='metrics'),
 ]
 
 auth_urls = ([